@@ -17,21 +17,33 @@ Standards implemented:
 """
 
 import argparse
+import contextlib
+import functools
+import hashlib
 import json
 import csv
+import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 try:
     import fitz  # PyMuPDF
-    from PIL import Image
     import numpy as np
 except ImportError as e:
     print(f"Error: Required library not found. Please install dependencies: pip install -r requirements.txt")
     print(f"Details: {e}")
     sys.exit(1)
 
+try:
+    import orjson  # Optional: much faster JSON export
+except ImportError:
+    orjson = None
+
 
 class ISO12647Standard:
     """
@@ -394,8 +406,19 @@ class PDFInkAnalyzer:
     SQ_INCH_TO_SQ_CM = 6.4516  # 1 square inch = 6.4516 square centimeters
     TONER_ML_PER_SQ_CM = 0.0005  # Average toner consumption: ~0.0005 mL per sq cm at 100% coverage
     
-    # Conversion method identifier
-    CONVERSION_METHOD_ADVANCED_GCR = 'advanced_gcr'
+    # Conversion method identifiers
+    CONVERSION_METHOD_ADVANCED_GCR = 'advanced_gcr'  # Render RGB, convert with gamma, GCR and dot gain
+    CONVERSION_METHOD_DEVICE_CMYK = 'device_cmyk'    # Render CMYK directly with MuPDF
+    CONVERSION_METHODS = (CONVERSION_METHOD_ADVANCED_GCR, CONVERSION_METHOD_DEVICE_CMYK)
+    
+    # CMYK channel names, in the order used for result keys
+    CMYK_CHANNELS = ('cyan', 'magenta', 'yellow', 'black')
+    
+    # Perceptual gamma used to linearize RGB before CMYK conversion
+    GAMMA = 2.2
+    
+    # Linearized value for every possible uint8 channel value: (v / 255) ** GAMMA
+    _GAMMA_LUT = np.power(np.arange(256, dtype=np.float64) / 255.0, GAMMA)
     
     # Dot gain compensation factors (based on ISO 12647 standards)
     DOT_GAIN_COMPENSATION = {
@@ -407,9 +430,73 @@ class PDFInkAnalyzer:
         'digital_press': 0.10          # ~10% dot gain
     }
     
+    # Per-page values kept in an array for get_summary(); tac_max is maximized, the rest averaged
+    PAGE_SUMMARY_KEYS = ('cyan_avg', 'magenta_avg', 'yellow_avg', 'black_avg', 'tac_avg', 'tac_max')
+    
+    # Legacy TAC limits (%) reported as exceeds_<limit> flags and page counts
+    LEGACY_TAC_THRESHOLDS = (280, 300, 320)
+    
+    # Per-page ink volume keys, summed across pages by get_summary()
+    INK_KEYS = ('ink_cyan_ml', 'ink_magenta_ml', 'ink_yellow_ml', 'ink_black_ml', 'ink_total_ml')
+    
+    # Console line for each ISO 12647 compliance status, formatted with the page's compliance dict
+    ISO_STATUS_MESSAGES = {
+        'compliant': "  ✓ ISO 12647 Compliant (TAC ≤ {warning_threshold}%)",
+        'within_limits_caution': "  ⚠️  Within ISO limits but near threshold (TAC ≤ {tac_limit}%)",
+        'exceeds_limit': "  ❌ Exceeds ISO 12647 limit (TAC > {tac_limit}%)"
+    }
+    
+    # Resolution of the first rendering pass in adaptive DPI mode
+    ADAPTIVE_PREVIEW_DPI = 72
+    
+    # Share of distinct colors in a strip above which it is reduced per pixel, not per color
+    MAX_DISTINCT_COLOR_RATIO = 0.25
+    
+    # TAC histogram resolution: bins per percent, and bins covering 0-400%
+    TAC_BINS_PER_PERCENT = 100
+    TAC_BINS = 400 * TAC_BINS_PER_PERCENT + 1
+    
+    # Pixels whose float32 TAC is this close (%) to a strip's largest are re-evaluated
+    # in float64 for tac_max; float32 sums of four table values are off by under 1e-4
+    TAC_FLOAT32_MARGIN = 0.01
+    
+    # Rows per strip when reducing a page; keeps a strip's intermediates in L2 cache
+    TILE_ROWS = 256
+    
+    # Shortest time in seconds between two progress lines on stderr
+    PROGRESS_INTERVAL = 0.5
+    
+    # Flattened ISO compliance CSV columns and the iso_compliance keys they come from
+    CSV_ISO_FIELDS = {
+        'iso_compliance_status': 'status',
+        'iso_compliance_severity': 'severity',
+        'iso_tac_limit': 'tac_limit',
+        'iso_process_description': 'description'
+    }
+    
+    # Number of analyses kept in a result cache directory; the least recently used are removed
+    RESULT_CACHE_SIZE = 64
+    
+    # Names of result cache entries (.json ones are left by version 1); eviction
+    # never touches other files in the directory
+    RESULT_CACHE_ENTRY = re.compile(r'[0-9a-f]{64}\.jsonl?')
+    
+    # Version of the cached result format; bump when page results change
+    RESULT_CACHE_VERSION = 2
+    
+    # Upper bound for automatically sized worker pools; page rendering and
+    # reduction are memory-bandwidth heavy, so more processes stop paying off
+    MAX_AUTO_WORKERS = 4
+    
     def __init__(self, pdf_path: str, dpi: int = 150, printer_profile: PrinterProfile = None,
                  iso_process: str = 'sheet_fed_coated', apply_dot_gain: bool = True,
-                 gcr_percentage: float = 0.8, cartridge_config: CartridgeConfig = None):
+                 gcr_percentage: float = 0.8, cartridge_config: CartridgeConfig = None,
+                 workers: int = 1, keep_results: bool = True,
+                 conversion_method: str = 'advanced_gcr',
+                 adaptive_dpi: bool = False, adaptive_tolerance: float = 0.1,
+                 tac_max_window: int = 1, show_progress: bool = True, pages: str = None,
+                 anti_aliasing: bool = True, cache_dir: str = None, stream_csv: str = None,
+                 stream_jsonl: str = None):
         """
         Initialize the analyzer
         
@@ -421,6 +508,37 @@ class PDFInkAnalyzer:
             apply_dot_gain: Apply dot gain compensation (default: True)
             gcr_percentage: Gray Component Replacement percentage 0.0-1.0 (default: 0.8 for 80% GCR)
             cartridge_config: CartridgeConfig for cost calculation (optional)
+            workers: Number of worker processes rendering and analyzing pages in parallel
+                     (default: 1 analyzes pages in this process; None picks one per CPU, up to MAX_AUTO_WORKERS)
+            keep_results: Keep per-page results in self.results (default: True). Summary
+                          statistics are accumulated either way, so get_summary() works without them
+            conversion_method: 'advanced_gcr' (default) converts rendered RGB with gamma correction
+                               and GCR; 'device_cmyk' has MuPDF render CMYK directly, which is faster
+                               and reads native CMYK content as-is (gcr_percentage is not used)
+            adaptive_dpi: Analyze each page at ADAPTIVE_PREVIEW_DPI first and only render it at dpi
+                          when the preview is not precise enough (default: False). Results report
+                          the resolution used as 'render_dpi'
+            adaptive_tolerance: Largest standard error (in coverage %) of a channel mean accepted
+                                from the preview pass (default: 0.1)
+            tac_max_window: Report tac_max as the largest mean TAC over blocks of N x N rendered
+                            pixels rather than of single pixels (default: 1), so isolated
+                            pixels do not count as ink limit violations. At most TILE_ROWS.
+            show_progress: Report analyzed pages on stderr, at most every PROGRESS_INTERVAL
+                           seconds (default: True)
+            pages: Page ranges to analyze, such as '1-10,20,30-' (1-indexed, default: all pages).
+                   Other pages are never rendered
+            anti_aliasing: Render with anti-aliasing (default: True). Without it, rendering is
+                           several times faster on vector-heavy pages, while coverage means move
+                           by a fraction of a percent as edges are no longer blended
+            cache_dir: Directory caching per-page results by PDF content and analysis
+                       settings (default: None, no caching). A repeated analysis of the same
+                       file is then read back instead of rendered. Entries are written as
+                       pages complete, so caching does not need keep_results
+            stream_csv: Write each page's CSV row to this file as soon as the page is
+                        analyzed (default: None). Gives the same file as export_to_csv()
+                        without needing keep_results
+            stream_jsonl: Write each page's result to this file as one line of JSON as soon
+                          as the page is analyzed (default: None), without needing keep_results
         """
         self.pdf_path = Path(pdf_path)
         self.dpi = dpi
@@ -429,197 +547,1019 @@ class PDFInkAnalyzer:
         self.apply_dot_gain = apply_dot_gain
         self.gcr_percentage = max(0.0, min(1.0, gcr_percentage))  # Clamp to 0-1
         self.cartridge_config = cartridge_config
+        self.workers = workers
+        self.keep_results = keep_results
+        self.conversion_method = conversion_method
+        self.adaptive_dpi = adaptive_dpi
+        self.adaptive_tolerance = adaptive_tolerance
+        self.tac_max_window = tac_max_window
+        self.show_progress = show_progress
+        self.pages = pages
+        self.anti_aliasing = anti_aliasing
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.stream_csv = stream_csv
+        self.stream_jsonl = stream_jsonl
         self.results = []
+        self._conversion_table_cache = None
+        self._coverage_table_cache = None
+        self._page_buffer_cache = {}
+        self._csv_stream = None
+        self._jsonl_stream = None
+        self._cache_stream = None
+        self._doc_key = None
+        self._doc_entry = None
+        self._reset_accumulators()
+        
+        if workers is not None and workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}")
+        
+        if not 1 <= tac_max_window <= self.TILE_ROWS:
+            raise ValueError(f"TAC max window must be between 1 and {self.TILE_ROWS} pixels, got {tac_max_window}")
+        
+        if conversion_method not in self.CONVERSION_METHODS:
+            raise ValueError(f"Unknown conversion method: {conversion_method}. Available: {list(self.CONVERSION_METHODS)}")
         
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
     
     def analyze(self) -> List[Dict]:
         """
-        Analyze all pages in the PDF
+        Analyze all pages in the PDF, or those selected with pages
         
         Returns:
             List of dictionaries containing analysis results for each page
         """
         try:
-            doc = fitz.open(self.pdf_path)
+            stat = self.pdf_path.stat()
+            key = (str(self.pdf_path.resolve()), stat.st_mtime_ns, stat.st_size, threading.get_ident())
+            if key != self._doc_key:
+                entry = _open_document(key)
+                self.close()
+                self._doc_key, self._doc_entry = key, entry
         except Exception as e:
             raise RuntimeError(f"Failed to open PDF: {e}")
+        doc = self._doc_entry[0]
+        
+        if self.stream_csv is None and self.stream_jsonl is None:
+            return self._analyze_or_load(doc)
+        
+        # Reject bad page ranges before any output is started
+        if self.pages is not None:
+            self._parse_page_ranges(self.pages, len(doc))
+        
+        # Streams go to temporary files next to their targets, which only replace
+        # the targets once the analysis succeeds
+        outputs = [(Path(f"{target}.{os.getpid()}.tmp"), target)
+                   for target in (self.stream_csv, self.stream_jsonl) if target is not None]
+        try:
+            with contextlib.ExitStack() as streams:
+                if self.stream_csv is not None:
+                    csv_file = streams.enter_context(open(outputs[0][0], 'w', newline='', encoding='utf-8'))
+                    writer = csv.writer(csv_file)
+                    fieldnames = self._csv_fieldnames(self.printer_profile is not None)
+                    writer.writerow(fieldnames)
+                    self._csv_stream = (writer, fieldnames)
+                if self.stream_jsonl is not None:
+                    self._jsonl_stream = streams.enter_context(open(outputs[-1][0], 'wb'))
+                try:
+                    self._analyze_or_load(doc)
+                finally:
+                    self._csv_stream = None
+                    self._jsonl_stream = None
+            for temp_path, target in outputs:
+                os.replace(temp_path, target)
+        finally:
+            for temp_path, _ in outputs:
+                with contextlib.suppress(OSError):
+                    temp_path.unlink()
+        
+        if self.stream_csv is not None:
+            print(f"Results exported to CSV: {self.stream_csv}", file=sys.stderr)
+        if self.stream_jsonl is not None:
+            print(f"Results exported to JSON Lines: {self.stream_jsonl}", file=sys.stderr)
+        return self.results
+    
+    def close(self):
+        """
+        Release the PDF opened by analyze()
+        
+        Documents stay open after analyze() so that repeated analyses of the same
+        file, by this or other analyzers, skip re-parsing it. Call close() once the
+        analyzer is done with the file, for example when analyzing many files in
+        turn. The document is closed, releasing the file handle (and the lock
+        Windows keeps on it), once no other analyzer holds it. A later analyze()
+        simply reopens the file.
+        """
+        if self._doc_entry is not None:
+            _release_document(self._doc_key, self._doc_entry)
+            self._doc_key = None
+            self._doc_entry = None
+    
+    def __getstate__(self) -> Dict:
+        """Pickle state for worker processes; open documents and output streams stay in this process"""
+        state = self.__dict__.copy()
+        state['_doc_key'] = None
+        state['_doc_entry'] = None
+        state['_csv_stream'] = None
+        state['_jsonl_stream'] = None
+        state['_cache_stream'] = None
+        return state
+    
+    def _analyze_or_load(self, doc: fitz.Document) -> List[Dict]:
+        """
+        Analyze the document, or read its results from the cache when available
+        
+        Args:
+            doc: Open PyMuPDF document
+        
+        Returns:
+            List of dictionaries containing analysis results for each page
+        """
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._result_cache_path()
+            if cache_path.exists():
+                results = self._load_cached_results(cache_path)
+                if results is not None:
+                    return results
+        
+        if cache_path is not None:
+            self._open_cache_entry(cache_path)
+        try:
+            if self.anti_aliasing:
+                self._analyze_pages(doc)
+            else:
+                # Anti-aliasing is a process-wide MuPDF setting, so restore it afterwards
+                aa_level = fitz.TOOLS.show_aa_level()['graphics']
+                fitz.TOOLS.set_aa_level(0)
+                try:
+                    self._analyze_pages(doc)
+                finally:
+                    fitz.TOOLS.set_aa_level(aa_level)
+        except BaseException:
+            self._close_cache_entry(None)
+            raise
+        self._close_cache_entry(cache_path)
+        return self.results
+    
+    def _result_cache_path(self) -> Path:
+        """
+        Cache file for the current PDF content and every setting that affects page results
+        
+        Returns:
+            Path of the JSON Lines file inside cache_dir
+        """
+        digest = hashlib.sha256()
+        with open(self.pdf_path, 'rb') as f:
+            for block in iter(functools.partial(f.read, 1 << 20), b''):
+                digest.update(block)
+        
+        settings = {
+            'version': self.RESULT_CACHE_VERSION,
+            'dpi': self.dpi,
+            'printer_profile': self.printer_profile.name if self.printer_profile else None,
+            'iso_process': self.iso_process,
+            'apply_dot_gain': self.apply_dot_gain,
+            'gcr_percentage': self.gcr_percentage,
+            'conversion_method': self.conversion_method,
+            'adaptive_dpi': self.adaptive_dpi,
+            'adaptive_tolerance': self.adaptive_tolerance,
+            'tac_max_window': self.tac_max_window,
+            'pages': self.pages,
+            'anti_aliasing': self.anti_aliasing
+        }
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return self.cache_dir / f"{digest.hexdigest()}.jsonl"
+    
+    def _load_cached_results(self, cache_path: Path) -> List[Dict]:
+        """
+        Record the page results of an earlier analysis read from the cache
+        
+        An entry holds one line of JSON per page and a final {"pages": count}
+        line. An entry that cannot be read or is incomplete, such as one
+        truncated by a full disk, is removed so the document is analyzed again;
+        it never fails the analysis.
+        
+        Args:
+            cache_path: Cache file from _result_cache_path()
+        
+        Returns:
+            List of dictionaries containing analysis results for each page, or
+            None when the entry was unreadable
+        """
+        try:
+            loads = orjson.loads if orjson is not None else json.loads
+            with open(cache_path, 'rb') as f:
+                lines = f.read().splitlines()
+            page_results = [loads(line) for line in lines[:-1]]
+            if not lines or loads(lines[-1]) != {'pages': len(page_results)}:
+                raise ValueError("incomplete entry")
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable result cache entry {cache_path}: {e}", file=sys.stderr)
+            with contextlib.suppress(OSError):
+                cache_path.unlink()
+            return None
+        
+        # Mark the entry as recently used; it may already be evicted by another
+        # process or belong to another user, and the results are read either way
+        with contextlib.suppress(OSError):
+            os.utime(cache_path)
         
         self.results = []
+        self._reset_accumulators(len(page_results))
+        for page_result in page_results:
+            self._record_page(page_result)
+        return self.results
+    
+    def _open_cache_entry(self, cache_path: Path):
+        """
+        Start writing a cache entry that _record_page() fills as pages complete
         
-        for page_num in range(len(doc)):
-            print(f"Analyzing page {page_num + 1}/{len(doc)}...", file=sys.stderr)
-            page = doc[page_num]
-            
-            # Render page to RGB pixmap
-            mat = fitz.Matrix(self.dpi / 72, self.dpi / 72)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
+        The entry is written under a temporary name, so readers never see a
+        partial file. A cache that cannot be written is skipped; it never fails
+        the analysis.
+        
+        Args:
+            cache_path: Cache file from _result_cache_path()
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            self._cache_stream = (open(temp_path, 'wb'), temp_path)
+        except OSError as e:
+            print(f"Warning: Could not write result cache: {e}", file=sys.stderr)
+    
+    def _write_cache_entry(self, page_result: Dict):
+        """Append a page result to the cache entry being written"""
+        try:
+            self._cache_stream[0].write(_json_line(page_result))
+        except OSError as e:
+            print(f"Warning: Could not write result cache: {e}", file=sys.stderr)
+            self._close_cache_entry(None)
+    
+    def _close_cache_entry(self, cache_path: Path):
+        """
+        Finish the cache entry being written and drop the least recently used entries
+        
+        Args:
+            cache_path: Cache file to move the entry to, or None to discard it
+                        (the analysis failed or the entry could not be written)
+        """
+        if self._cache_stream is None:
+            return
+        f, temp_path = self._cache_stream
+        self._cache_stream = None
+        try:
+            if cache_path is None:
+                f.close()
+                temp_path.unlink()
+                return
             
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            f.write(_json_line({'pages': self._acc['n']}))
+            f.close()
+            os.replace(temp_path, cache_path)
             
-            # Analyze the page using RGB to CMYK conversion
-            page_result = self._analyze_page_rgb(img, page_num + 1)
-            self.results.append(page_result)
+            entries = sorted((path for path in self.cache_dir.iterdir()
+                              if self.RESULT_CACHE_ENTRY.fullmatch(path.name)),
+                             key=lambda path: path.stat().st_mtime)
+            for path in entries[:-self.RESULT_CACHE_SIZE]:
+                path.unlink()
+        except OSError as e:
+            print(f"Warning: Could not write result cache: {e}", file=sys.stderr)
+            with contextlib.suppress(OSError):
+                f.close()
+            with contextlib.suppress(OSError):
+                temp_path.unlink()
+    
+    def _analyze_pages(self, doc: fitz.Document) -> List[Dict]:
+        """
+        Analyze the selected pages of an open document
+        
+        Args:
+            doc: Open PyMuPDF document
         
-        doc.close()
+        Returns:
+            List of dictionaries containing analysis results for each page
+        """
+        self.results = []
+        page_numbers = list(range(len(doc)))
+        if self.pages is not None:
+            page_numbers = self._parse_page_ranges(self.pages, len(doc))
+        page_count = len(page_numbers)
+        self._reset_accumulators(page_count)
+        workers = self._resolve_workers(page_count)
+        
+        if workers > 1:
+            # Each worker opens its own copy of the document, so only page numbers
+            # and result dictionaries cross the process boundary (never pixmaps)
+            # Hand out pages in batches, about four per worker, so long documents
+            # do not pay one inter-process round trip per page while uneven pages
+            # still balance across workers
+            chunksize = max(1, page_count // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                                     initargs=(self,)) as executor:
+                # map() yields results in page order
+                for page_result in executor.map(_analyze_page_in_worker, page_numbers,
+                                                chunksize=chunksize):
+                    self._record_page(page_result)
+            return self.results
+        
+        matrix = self._render_matrix()
+        for page_num in page_numbers:
+            self._record_page(self._analyze_page(doc, page_num, matrix))
+        
+        self._page_buffer_cache = {}
         return self.results
     
-    def _rgb_to_cmyk_advanced(self, rgb_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    @staticmethod
+    def _parse_page_ranges(pages: str, page_count: int) -> List[int]:
+        """
+        Resolve a page range specification against a document
+        
+        Args:
+            pages: Comma-separated page numbers and ranges (1-indexed), such as
+                   '1-10,20,30-'; a range without a start or end runs from the
+                   first or to the last page
+            page_count: Number of pages in the document
+        
+        Returns:
+            Sorted indexes (0-indexed) of the selected pages, without duplicates
+        """
+        selected = set()
+        for part in pages.split(','):
+            first, separator, last = part.strip().partition('-')
+            try:
+                if not (first or separator):
+                    raise ValueError
+                first = int(first) if first else 1
+                last = (int(last) if last else page_count) if separator else first
+            except ValueError:
+                raise ValueError(f"Invalid page range: {part.strip()!r}")
+            if not 1 <= first <= last <= page_count:
+                raise ValueError(f"Page range {part.strip()!r} is not within the document's {page_count} pages")
+            selected.update(range(first - 1, last))
+        return sorted(selected)
+    
+    def _reset_accumulators(self, page_count: int = 0):
+        """
+        Reset the running totals used by get_summary()
+        
+        Args:
+            page_count: Number of pages about to be recorded, sizing the per-page arrays
+        """
+        # Per-page summary values, legacy threshold flags and ink volumes, one row per page
+        self._page_values = np.zeros((page_count, len(self.PAGE_SUMMARY_KEYS)))
+        self._page_exceeds = np.zeros((page_count, len(self.LEGACY_TAC_THRESHOLDS)), dtype=bool)
+        self._page_ink = np.zeros((page_count, len(self.INK_KEYS)))
+        self._acc = {
+            'n': 0,
+            'compliant': 0, 'within_limits_caution': 0, 'exceeds_limit': 0,
+            'has_ink': False
+        }
+        self._progress_time = None
+    
+    def _record_page(self, page_result: Dict):
+        """
+        Fold a page result into the summary accumulators and keep it if requested
+        
+        Args:
+            page_result: Dictionary returned by _calculate_page_statistics()
+        """
+        acc = self._acc
+        row = acc['n']
+        acc['n'] += 1
+        self._page_values[row] = [page_result[key] for key in self.PAGE_SUMMARY_KEYS]
+        self._page_exceeds[row] = [page_result[f'exceeds_{threshold}'] for threshold in self.LEGACY_TAC_THRESHOLDS]
+        status = page_result['iso_compliance']['status']
+        if status in acc:
+            acc[status] += 1
+        
+        if 'ink_total_ml' in page_result:
+            acc['has_ink'] = True
+            self._page_ink[row] = [page_result[key] for key in self.INK_KEYS]
+        
+        if self.keep_results:
+            self.results.append(page_result)
+        
+        if self._cache_stream is not None:
+            self._write_cache_entry(page_result)
+        
+        if self._csv_stream is not None:
+            writer, fieldnames = self._csv_stream
+            writer.writerow(self._csv_row(page_result, fieldnames))
+        
+        if self._jsonl_stream is not None:
+            self._jsonl_stream.write(_json_line(page_result))
+        
+        if self.show_progress:
+            self._report_progress(acc['n'])
+    
+    def _report_progress(self, pages_done: int):
         """
-        Convert RGB image to CMYK using advanced method with GCR
+        Print the number of analyzed pages to stderr, rate-limited to PROGRESS_INTERVAL
         
-        This method implements:
-        - Perceptual gamma correction
-        - Gray Component Replacement (GCR) for better black generation
-        - Optional UCR (Under Color Removal)
+        Long documents would otherwise write and flush one line per page. The
+        first and last pages are always reported.
         
         Args:
-            rgb_array: RGB image as numpy array (height, width, 3)
+            pages_done: Number of pages recorded so far
+        """
+        page_count = len(self._page_values)
+        now = time.monotonic()
+        if (self._progress_time is not None and pages_done < page_count
+                and now - self._progress_time < self.PROGRESS_INTERVAL):
+            return
+        self._progress_time = now
+        print(f"Analyzed page {pages_done}/{page_count}", file=sys.stderr)
+    
+    def _resolve_workers(self, page_count: int) -> int:
+        """
+        Determine how many worker processes to use for a document
+        
+        Args:
+            page_count: Number of pages in the document
         
         Returns:
-            Tuple of (C, M, Y, K) arrays normalized to 0-100%
+            Number of workers, never more than the number of pages
         """
-        # Normalize RGB to 0-1
-        rgb = rgb_array.astype(float) / 255.0
+        workers = self.workers
+        if workers is None:
+            workers = min(os.cpu_count() or 1, self.MAX_AUTO_WORKERS)
+        return max(1, min(workers, page_count))
+    
+    def _render_matrix(self) -> fitz.Matrix:
+        """Transformation matrix rendering pages at the analysis DPI"""
+        return fitz.Matrix(self.dpi / 72, self.dpi / 72)
+    
+    def _page_buffers(self, width: int) -> Dict[str, np.ndarray]:
+        """
+        Scratch buffers for reducing a page strip by strip, reused across pages
+        
+        The buffers hold one strip of TILE_ROWS rows, so they depend only on the
+        page width. Buffers for the two most recent widths are kept, which covers
+        documents mixing two page sizes and the preview pass of adaptive DPI.
         
+        Args:
+            width: Page width in pixels
+        
+        Returns:
+            Dictionary with strip-sized 'color_key' (uint32), 'tac_bins' (uint16)
+            and 'tac' and 'gathered' (float32) arrays
+        """
+        buffers = self._page_buffer_cache.get(width)
+        if buffers is None:
+            tile_shape = (self.TILE_ROWS, width)
+            buffers = {
+                'tac': np.empty(tile_shape, dtype=np.float32),
+                'tac_bins': np.empty(tile_shape, dtype=np.uint16),
+                'color_key': np.empty(tile_shape, dtype=np.uint32),
+                'gathered': np.empty(tile_shape, dtype=np.float32)
+            }
+            if len(self._page_buffer_cache) >= 2:
+                # Drop the least recently allocated width
+                del self._page_buffer_cache[next(iter(self._page_buffer_cache))]
+            self._page_buffer_cache[width] = buffers
+        return buffers
+    
+    def _analyze_page(self, doc: fitz.Document, page_num: int, matrix: fitz.Matrix) -> Dict:
+        """
+        Render and analyze a single page of an open document
+        
+        Pages that draw nothing are not rendered at all and get zero coverage.
+        With adaptive_dpi, the page is first rendered at ADAPTIVE_PREVIEW_DPI and
+        only rendered again at the analysis DPI if a channel mean is less precise
+        than adaptive_tolerance.
+        
+        Args:
+            doc: Open PyMuPDF document
+            page_num: Page index (0-indexed)
+            matrix: Render matrix from _render_matrix()
+        
+        Returns:
+            Dictionary with analysis results for the page
+        """
+        page = doc[page_num]
+        
+        if self._is_blank(page):
+            result = self._calculate_page_statistics(self._blank_page_stats(), page_num + 1)
+            if self.adaptive_dpi:
+                result['render_dpi'] = None
+            return result
+        
+        if self.adaptive_dpi and self.dpi > self.ADAPTIVE_PREVIEW_DPI:
+            preview_dpi = self.ADAPTIVE_PREVIEW_DPI
+            stats, pixel_count = self._render_and_reduce(page, fitz.Matrix(preview_dpi / 72, preview_dpi / 72))
+            
+            # Standard error of each channel mean over the preview pixels
+            standard_error = max(stats[f'{channel}_std'] for channel in self.CMYK_CHANNELS) / np.sqrt(pixel_count)
+            if standard_error <= self.adaptive_tolerance:
+                # Ink volumes integrate over pixels; scale them to the analysis resolution
+                area_scale = (self.dpi / preview_dpi) ** 2
+                for channel in self.CMYK_CHANNELS:
+                    if f'ink_{channel}_ml' in stats:
+                        stats[f'ink_{channel}_ml'] *= area_scale
+                result = self._calculate_page_statistics(stats, page_num + 1)
+                result['render_dpi'] = preview_dpi
+                return result
+        
+        stats, _ = self._render_and_reduce(page, matrix)
+        result = self._calculate_page_statistics(stats, page_num + 1)
+        if self.adaptive_dpi:
+            result['render_dpi'] = self.dpi
+        return result
+    
+    @staticmethod
+    def _is_blank(page: fitz.Page) -> bool:
+        """
+        Check whether a page would render as plain white
+        
+        The bbox log lists every fill, stroke, text and image operation of the page
+        content without rasterizing it; annotations are rendered separately.
+        """
+        return not page.get_bboxlog() and page.first_annot is None
+    
+    def _blank_page_stats(self) -> Dict[str, float]:
+        """Statistics of a page without any ink, as the reducers would return them"""
+        stats = {}
+        for channel in self.CMYK_CHANNELS:
+            stats[f'{channel}_avg'] = 0.0
+            stats[f'{channel}_std'] = 0.0
+            if self.printer_profile:
+                stats[f'ink_{channel}_ml'] = 0.0
+        for key in ('tac_avg', 'tac_max', 'tac_std', 'tac_median', 'tac_p95', 'tac_p99'):
+            stats[key] = 0.0
+        return stats
+    
+    def _render_and_reduce(self, page: fitz.Page, matrix: fitz.Matrix) -> Tuple[Dict[str, float], int]:
+        """
+        Render a page and reduce it to scalar coverage statistics
+        
+        Args:
+            page: PyMuPDF page
+            matrix: Render matrix
+        
+        Returns:
+            Tuple of (statistics from the conversion method's reducer, number of pixels rendered)
+        """
+        if self.conversion_method == self.CONVERSION_METHOD_DEVICE_CMYK:
+            # Let MuPDF render straight into CMYK and reduce its samples directly
+            pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csCMYK, alpha=False)
+            cmyk_array = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            return self._reduce_page_cmyk(cmyk_array), pix.width * pix.height
+        
+        # Render page to RGB pixmap
+        pix = page.get_pixmap(matrix=matrix, alpha=False)
+        
+        # View the pixmap samples as an array without copying them. samples_mv
+        # aliases MuPDF's own buffer (samples would copy it into a bytes object),
+        # so pix must stay alive until the page has been reduced
+        rgb_array = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+        
+        # Convert to CMYK and reduce to scalar statistics
+        return self._reduce_page_rgb(rgb_array), pix.width * pix.height
+    
+    def _black_generation(self, rgb_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the black (K) channel of an RGB image using GCR
+        
+        Args:
+            rgb_array: RGB image as uint8 numpy array (height, width, 3)
+        
+        Returns:
+            Tuple of (K, 1 - K) arrays in 0-1 range
+        """
         # Apply perceptual gamma correction for more accurate conversion
-        # This accounts for the non-linear perception of color
-        gamma = 2.2
-        rgb_linear = np.power(rgb, gamma)
+        # This accounts for the non-linear perception of color. The input is uint8,
+        # so indexing the lookup table replaces a float copy and a per-pixel power
+        rgb_linear = self._GAMMA_LUT
         
         # Calculate K (black) using maximum method
-        k_max = 1 - np.max(rgb_linear, axis=2)
+        # Gamma is monotonic, so the maximum can be taken on the uint8 values directly
+        k_max = 1 - rgb_linear[np.max(rgb_array, axis=2)]
         
         # Implement GCR (Gray Component Replacement)
         # This replaces CMY with K where appropriate, saving colored ink
         
-        # Calculate the minimum of CMY (this is the gray component)
-        r_inv = 1 - rgb_linear[:, :, 0]
-        g_inv = 1 - rgb_linear[:, :, 1]
-        b_inv = 1 - rgb_linear[:, :, 2]
-        
-        gray_component = np.minimum(np.minimum(r_inv, g_inv), b_inv)
+        # The gray component min(1-R, 1-G, 1-B) is exactly 1 - max(R, G, B)
+        gray_component = k_max
         
         # Apply GCR: use more K, less CMY
         k = k_max * (1 - self.gcr_percentage) + gray_component * self.gcr_percentage
         
-        # Avoid division by zero
-        k_inv = 1 - k
-        k_inv = np.where(k_inv == 0, 1e-10, k_inv)
+        return k, 1 - k
+    
+    def _cmy_from_channel(self, channel: np.ndarray, k: np.ndarray, k_inv: np.ndarray) -> np.ndarray:
+        """
+        Calculate one CMY channel from the complementary RGB channel
         
-        # Calculate CMY with GCR adjustment
-        c = (1 - rgb_linear[:, :, 0] - k) / k_inv
-        m = (1 - rgb_linear[:, :, 1] - k) / k_inv
-        y = (1 - rgb_linear[:, :, 2] - k) / k_inv
+        Args:
+            channel: uint8 RGB channel (height, width): red for cyan, green for magenta, blue for yellow
+            k, k_inv: Black channel and its complement from _black_generation()
         
-        # Clip values to 0-1 range and convert to percentage
-        c = np.clip(c, 0, 1) * 100
-        m = np.clip(m, 0, 1) * 100
-        y = np.clip(y, 0, 1) * 100
-        k = np.clip(k, 0, 1) * 100
+        Returns:
+            Channel coverage array normalized to 0-100%
+        """
+        coverage = 1 - self._GAMMA_LUT[channel] - k
+        
+        # Divide in place, skipping pure black pixels (1 - K == 0). Their numerator
+        # is never positive, so the clip below turns them into 0% as before
+        np.divide(coverage, k_inv, out=coverage, where=k_inv != 0)
         
-        return c, m, y, k
+        # Clip values to 0-1 range and convert to percentage
+        np.clip(coverage, 0, 1, out=coverage)
+        coverage *= 100
+        return coverage
     
-    def _apply_dot_gain_compensation(self, c: np.ndarray, m: np.ndarray, y: np.ndarray, k: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    def _compensate_dot_gain(self, coverage: np.ndarray) -> np.ndarray:
         """
-        Apply dot gain compensation based on ISO 12647 standards
-        
-        Dot gain is the increase in dot size during the printing process.
-        This compensation adjusts the measured coverage to account for physical ink spreading.
+        Apply dot gain compensation to a single channel
         
         Args:
-            c, m, y, k: CMYK arrays (0-100%)
+            coverage: Channel coverage array (0-100%)
         
         Returns:
-            Compensated CMYK arrays
+            Compensated coverage array
         """
-        if not self.apply_dot_gain:
-            return c, m, y, k
-        
         # Get dot gain factor for the current ISO process
         dot_gain = self.DOT_GAIN_COMPENSATION.get(self.iso_process, 0.15)
         
         # Apply dot gain compensation
         # Formula: compensated = original * (1 + dot_gain * (original / 100))
         # This accounts for the fact that dot gain is more pronounced at mid-tones
-        c_comp = c * (1 + dot_gain * (c / 100.0))
-        m_comp = m * (1 + dot_gain * (m / 100.0))
-        y_comp = y * (1 + dot_gain * (y / 100.0))
-        k_comp = k * (1 + dot_gain * (k / 100.0))
+        compensated = coverage * (1 + dot_gain * (coverage / 100.0))
         
         # Ensure we don't exceed 100%
-        c_comp = np.clip(c_comp, 0, 100)
-        m_comp = np.clip(m_comp, 0, 100)
-        y_comp = np.clip(y_comp, 0, 100)
-        k_comp = np.clip(k_comp, 0, 100)
-        
-        return c_comp, m_comp, y_comp, k_comp
-    
+        return np.clip(compensated, 0, 100)
     
-    def _analyze_page_rgb(self, img: Image.Image, page_num: int) -> Dict:
+    def _analyze_page_rgb(self, rgb_array: np.ndarray, page_num: int) -> Dict:
         """
         Analyze a single page using RGB to CMYK conversion
         
         Args:
-            img: PIL Image object
+            rgb_array: RGB image as uint8 numpy array (height, width, 3)
             page_num: Page number (1-indexed)
         
         Returns:
             Dictionary with analysis results including ISO compliance
         """
-        # Convert to numpy array
-        rgb_array = np.array(img)
+        # Convert to CMYK and reduce to scalar statistics
+        stats = self._reduce_page_rgb(rgb_array)
+        
+        return self._calculate_page_statistics(stats, page_num)
+    
+    def _conversion_tables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tabulate channel coverage before dot gain for every possible uint8 input
         
-        # Convert to CMYK using advanced method
-        c, m, y, k = self._rgb_to_cmyk_advanced(rgb_array)
+        After gamma correction and GCR, a C, M or Y value depends only on the
+        pixel's max(R, G, B) and its complementary RGB channel, and K only on the
+        max. Both tables are built with the per-pixel conversion methods
+        themselves, so table lookups reproduce them exactly.
+        
+        Returns:
+            Tuple of (flattened CMY table indexed max << 8 | channel, K table
+            indexed by max), both as coverage percentages (0-100%)
+        """
+        if self._conversion_table_cache is not None and self._conversion_table_cache[0] == self.gcr_percentage:
+            return self._conversion_table_cache[1]
+        
+        levels = np.arange(256, dtype=np.uint8)
+        
+        # A column of gray pixels has every possible max(R, G, B)
+        k, k_inv = self._black_generation(np.repeat(levels, 3).reshape(256, 1, 3))
+        cmy_table = self._cmy_from_channel(levels.reshape(1, 256), k, k_inv).ravel()
+        black_table = np.clip(k[:, 0], 0, 1) * 100
+        
+        tables = (cmy_table, black_table)
+        self._conversion_table_cache = (self.gcr_percentage, tables)
+        return tables
+    
+    def _coverage_tables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tabulate final channel coverage for every possible uint8 input
+        
+        Returns:
+            The _conversion_tables() with dot gain compensation applied when enabled
+        """
+        key = (self.gcr_percentage, self.apply_dot_gain, self.iso_process)
+        if self._coverage_table_cache is not None and self._coverage_table_cache[0] == key:
+            return self._coverage_table_cache[1]
+        
+        cmy_table, black_table = self._conversion_tables()
         
-        # Apply dot gain compensation if enabled
         if self.apply_dot_gain:
-            c, m, y, k = self._apply_dot_gain_compensation(c, m, y, k)
+            cmy_table = self._compensate_dot_gain(cmy_table)
+            black_table = self._compensate_dot_gain(black_table)
         
-        # Calculate statistics
-        return self._calculate_page_statistics(c, m, y, k, page_num, rgb_array.shape[:2])
+        tables = (cmy_table, black_table)
+        self._coverage_table_cache = (key, tables)
+        return tables
     
-    def _calculate_page_statistics(self, c: np.ndarray, m: np.ndarray, y: np.ndarray, k: np.ndarray,
-                                   page_num: int, shape: Tuple[int, int]) -> Dict:
+    def _reduce_page_rgb(self, rgb_array: np.ndarray) -> Dict[str, float]:
         """
-        Calculate statistical metrics for a page
+        Convert an RGB page to CMYK and reduce it to scalar coverage statistics
+        
+        Rendered pages hold far fewer distinct colors than pixels, so each strip of
+        TILE_ROWS rows is reduced to its distinct 24-bit colors and their pixel
+        counts first. Everything else runs once per color: the colors are
+        histogrammed by their (max(R, G, B), channel) pairs, from which the channel
+        statistics are computed with _coverage_tables(), and their TAC, gathered
+        from the same tables, is folded into a TAC histogram weighted by the counts.
+        No floating-point CMYK plane is ever built.
         
         Args:
-            c, m, y, k: CMYK arrays (0-100%)
-            page_num: Page number (1-indexed)
-            shape: Image shape (height, width)
+            rgb_array: RGB image as uint8 numpy array (height, width, 3)
         
         Returns:
-            Dictionary with analysis results including ISO compliance and statistical metrics
+            Dictionary with per-channel '<channel>_avg', '<channel>_std' and (with a
+            printer profile) 'ink_<channel>_ml' values, plus TAC statistics
+        """
+        stats = {}
+        cmy_flat, black_table = self._coverage_tables()
+        
+        # Per-pixel strips gather TAC in float32 to halve the bytes moved; per-color
+        # strips and the TAC maximum use the float64 tables
+        cmy_gather = cmy_flat.astype(np.float32)
+        black_gather = black_table.astype(np.float32)
+        
+        rgb_array = np.ascontiguousarray(rgb_array)
+        height, width = rgb_array.shape[:2]
+        buffers = self._page_buffers(width)
+        
+        # Weighted bincounts return float64; pixel counts stay exact far beyond any page size
+        cmy_counts = np.zeros((3, cmy_flat.size))
+        black_counts = np.zeros(black_table.size)
+        tac_counts = np.zeros(self.TAC_BINS)
+        tac_max = 0.0
+        
+        strip_rows = self._strip_rows()
+        for row in range(0, height, strip_rows):
+            tile = rgb_array[row:row + strip_rows]
+            rows = tile.shape[0]
+            color_key = buffers['color_key'][:rows]
+            
+            # Pack each pixel into a 0xBBGGRR key and count the distinct colors
+            self._pack_colors(tile, color_key)
+            colors, pixel_counts = np.unique(color_key, return_counts=True)
+            
+            if colors.size > color_key.size * self.MAX_DISTINCT_COLOR_RATIO:
+                # Mostly distinct colors (photographs): reduce the pixels themselves
+                channels = [tile[:, :, index].ravel() for index in range(3)]
+                pixel_counts = None
+                tac_tables = (cmy_gather, black_gather)
+            else:
+                channels = [(colors >> shift).astype(np.uint8) for shift in (0, 8, 16)]
+                tac_tables = (cmy_flat, black_table)
+            max_rgb = np.maximum(np.maximum(channels[0], channels[1]), channels[2])
+            index_base = max_rgb.astype(np.uint16) << 8
+            
+            # Histogram and gather CMY one channel at a time
+            lookups = []
+            for index, channel in enumerate(channels):
+                table_index = index_base | channel
+                lookups.append((cmy_flat, table_index))
+                cmy_counts[index] += np.bincount(table_index, weights=pixel_counts, minlength=cmy_flat.size)
+                
+                # Accumulate TAC (Total Area Coverage) in place
+                if index == 0:
+                    tac = tac_tables[0][table_index]
+                else:
+                    tac += tac_tables[0][table_index]
+            lookups.append((black_table, max_rgb))
+            
+            black_counts += np.bincount(max_rgb, weights=pixel_counts, minlength=black_table.size)
+            tac += tac_tables[1][max_rgb]
+            
+            if pixel_counts is None:
+                tac_max = max(tac_max, self._strip_tac_max(tac.reshape(rows, width), lookups))
+            elif self.tac_max_window > 1:
+                # Block means need the TAC of every pixel, not of every color
+                tac_max = max(tac_max, self._strip_tac_max(tac[np.searchsorted(colors, color_key)]))
+            else:
+                tac_max = max(tac_max, self._strip_tac_max(tac))
+            self._bin_tac(tac, np.empty(tac.shape, dtype=np.uint16), tac_counts, pixel_counts)
+        
+        pixel_count = height * width
+        for index, channel in enumerate(self.CMYK_CHANNELS[:3]):
+            self._reduce_channel(cmy_flat, cmy_counts[index], pixel_count, channel, stats)
+        self._reduce_channel(black_table, black_counts, pixel_count, 'black', stats)
+        
+        self._reduce_tac(tac_counts, tac_max, stats)
+        return stats
+    
+    @staticmethod
+    def _pack_colors(tile: np.ndarray, color_key: np.ndarray):
+        """
+        Pack the pixels of a C-contiguous RGB strip into uint32 0xBBGGRR color keys
+        
+        Every pixel but the last is read with a single unaligned little-endian
+        32-bit load starting at its red byte, and the neighbouring pixel's red
+        byte in the top 8 bits is masked off. The last pixel's load would run
+        past the end of the strip, so it is packed from its channels.
+        
+        Args:
+            tile: RGB strip as C-contiguous uint8 array (rows, width, 3)
+            color_key: uint32 array (rows, width) receiving the keys
+        """
+        keys = color_key.reshape(-1)
+        loads = np.ndarray((keys.size - 1,), dtype='<u4', buffer=tile, strides=(3,))
+        np.bitwise_and(loads, 0xFFFFFF, out=keys[:-1])
+        red, green, blue = (int(value) for value in tile[-1, -1])
+        keys[-1] = red | green << 8 | blue << 16
+    
+    def _reduce_page_cmyk(self, cmyk_array: np.ndarray) -> Dict[str, float]:
+        """
+        Reduce a page rendered in CMYK to scalar coverage statistics
+        
+        Like _reduce_page_rgb(), each strip is reduced to its distinct colors and
+        their pixel counts first. A CMYK pixel is exactly four bytes, so the strip
+        reads as uint32 color keys without any packing.
+        
+        Args:
+            cmyk_array: CMYK image as uint8 numpy array (height, width, 4)
+        
+        Returns:
+            Dictionary with the same statistics as _reduce_page_rgb()
+        """
+        stats = {}
+        
+        # Device values map straight to coverage; only dot gain remains to be applied
+        table = np.arange(256, dtype=np.float64) / 255.0 * 100
+        if self.apply_dot_gain:
+            table = self._compensate_dot_gain(table)
+        table_gather = table.astype(np.float32)
+        
+        cmyk_array = np.ascontiguousarray(cmyk_array)
+        height, width = cmyk_array.shape[:2]
+        buffers = self._page_buffers(width)
+        
+        # Weighted bincounts return float64; pixel counts stay exact far beyond any page size
+        counts = np.zeros((len(self.CMYK_CHANNELS), table.size))
+        tac_counts = np.zeros(self.TAC_BINS)
+        tac_max = 0.0
+        
+        strip_rows = self._strip_rows()
+        for row in range(0, height, strip_rows):
+            tile = cmyk_array[row:row + strip_rows]
+            rows = tile.shape[0]
+            color_key = tile.view('<u4').reshape(rows, width)
+            colors, pixel_counts = np.unique(color_key, return_counts=True)
+            
+            if colors.size > color_key.size * self.MAX_DISTINCT_COLOR_RATIO:
+                # Mostly distinct colors (photographs): reduce the pixels themselves
+                channels = [tile[:, :, index] for index in range(len(self.CMYK_CHANNELS))]
+                pixel_counts = None
+                tac = buffers['tac'][:rows]
+                gathered = buffers['gathered'][:rows]
+                tac_bins = buffers['tac_bins'][:rows]
+                tac_table = table_gather
+            else:
+                channels = [(colors >> shift).astype(np.uint8) for shift in (0, 8, 16, 24)]
+                tac = np.empty(colors.shape)
+                gathered = np.empty_like(tac)
+                tac_bins = np.empty(colors.shape, dtype=np.uint16)
+                tac_table = table
+            
+            for index, channel in enumerate(channels):
+                counts[index] += np.bincount(channel.ravel(), weights=pixel_counts, minlength=table.size)
+                
+                if index == 0:
+                    np.take(tac_table, channel, out=tac, mode='clip')
+                else:
+                    tac += np.take(tac_table, channel, out=gathered, mode='clip')
+            
+            if pixel_counts is None:
+                tac_max = max(tac_max, self._strip_tac_max(tac, [(table, channel) for channel in channels]))
+            elif self.tac_max_window > 1:
+                # Block means need the TAC of every pixel, not of every color
+                tac_max = max(tac_max, self._strip_tac_max(tac[np.searchsorted(colors, color_key)]))
+            else:
+                tac_max = max(tac_max, self._strip_tac_max(tac))
+            self._bin_tac(tac, tac_bins, tac_counts, pixel_counts)
+        
+        pixel_count = height * width
+        for index, channel in enumerate(self.CMYK_CHANNELS):
+            self._reduce_channel(table, counts[index], pixel_count, channel, stats)
+        
+        self._reduce_tac(tac_counts, tac_max, stats)
+        return stats
+    
+    def _strip_rows(self) -> int:
+        """Rows per reduced strip: TILE_ROWS, rounded down so TAC max blocks never span two strips"""
+        return self.TILE_ROWS - self.TILE_ROWS % self.tac_max_window
+    
+    def _strip_tac_max(self, tac: np.ndarray, lookups: List[Tuple[np.ndarray, np.ndarray]] = None) -> float:
+        """
+        Largest TAC in a strip, over single pixels or tac_max_window blocks
+        
+        Blocks cut off by the page edge are averaged over the pixels they contain.
+        The maximum decides the TAC limit flags, so it is always taken from float64
+        values: when tac was gathered in float32, the pixels that may hold it are
+        evaluated again from the float64 coverage tables.
+        
+        Args:
+            tac: Total Area Coverage of the strip (0-400%); per pixel (rows, width)
+                 when tac_max_window is above 1 or lookups are given
+            lookups: (float64 table, per-pixel table indices) pairs whose gathered
+                     values sum to the TAC, when tac is only a float32 approximation
+        
+        Returns:
+            Largest pixel or block mean TAC in the strip
+        """
+        window = self.tac_max_window
+        if window == 1:
+            if lookups is None:
+                return float(tac.max())
+            candidates = np.flatnonzero(tac >= tac.max() - self.TAC_FLOAT32_MARGIN)
+            return float(sum(table[indices.flat[candidates]] for table, indices in lookups).max())
+        
+        if lookups is not None:
+            tac = sum(table[indices] for table, indices in lookups).reshape(tac.shape)
+        
+        rows, width = tac.shape
+        row_starts = np.arange(0, rows, window)
+        column_starts = np.arange(0, width, window)
+        block_sums = np.add.reduceat(np.add.reduceat(tac, row_starts, axis=0), column_starts, axis=1)
+        block_sizes = np.outer(np.diff(row_starts, append=rows), np.diff(column_starts, append=width))
+        return float((block_sums / block_sizes).max())
+    
+    def _bin_tac(self, tac: np.ndarray, tac_bins: np.ndarray, tac_counts: np.ndarray,
+                 weights: np.ndarray = None):
         """
-        height, width = shape
+        Fold a strip's per-pixel TAC into the page's TAC histogram
         
-        # Calculate average coverage for each channel
-        avg_c = float(np.mean(c))
-        avg_m = float(np.mean(m))
-        avg_y = float(np.mean(y))
-        avg_k = float(np.mean(k))
+        Args:
+            tac: Total Area Coverage of the strip (0-400%); overwritten
+            tac_bins: uint16 scratch array with the shape of tac
+            tac_counts: TAC histogram with TAC_BINS_PER_PERCENT bins per percent, updated in place
+            weights: Optional number of pixels behind each TAC value (tac_counts must then be float)
+        """
+        # TAC is never negative, so adding half a bin and truncating rounds to the nearest bin
+        np.multiply(tac, self.TAC_BINS_PER_PERCENT, out=tac)
+        np.add(tac, 0.5, out=tac)
+        np.copyto(tac_bins, tac, casting='unsafe')
+        tac_counts += np.bincount(tac_bins.ravel(), weights=weights, minlength=tac_counts.size)
+    
+    def _reduce_tac(self, tac_counts: np.ndarray, tac_max: float, stats: Dict[str, float]):
+        """
+        Reduce the TAC histogram of a page into the page statistics
         
-        # Calculate standard deviations for accuracy reporting
-        std_c = float(np.std(c))
-        std_m = float(np.std(m))
-        std_y = float(np.std(y))
-        std_k = float(np.std(k))
+        Args:
+            tac_counts: TAC histogram filled by _bin_tac()
+            tac_max: Largest TAC on the page, per pixel or per tac_max_window block
+            stats: Statistics dictionary with the channel averages, to update
+        """
+        # The mean TAC is the sum of the channel means, which come from exact histograms
+        tac_avg = sum(stats[f'{channel}_avg'] for channel in self.CMYK_CHANNELS)
+        values = np.arange(tac_counts.size) / self.TAC_BINS_PER_PERCENT
+        pixel_count = int(tac_counts.sum())
+        
+        stats['tac_avg'] = tac_avg
+        stats['tac_max'] = tac_max
+        stats['tac_std'] = float(np.sqrt(np.dot(tac_counts, (values - tac_avg) ** 2) / pixel_count))
+        
+        # Percentiles interpolate linearly between the closest ranks, like np.percentile
+        cumulative = np.cumsum(tac_counts)
+        for key, percentile in (('tac_median', 50), ('tac_p95', 95), ('tac_p99', 99)):
+            rank = percentile / 100 * (pixel_count - 1)
+            lower = int(rank)
+            low_value, high_value = values[np.searchsorted(cumulative, [lower, min(lower + 1, pixel_count - 1)],
+                                                           side='right')]
+            stats[key] = float(low_value + (high_value - low_value) * (rank - lower))
+    
+    def _reduce_channel(self, table: np.ndarray, counts: np.ndarray, pixel_count: int,
+                        channel: str, stats: Dict[str, float]):
+        """
+        Reduce one channel's coverage histogram into the page statistics
         
-        # Calculate TAC (Total Area Coverage) for each pixel
-        tac = c + m + y + k
+        Args:
+            table: Coverage value (0-100%) for each histogram bin
+            counts: Number of pixels in each histogram bin
+            pixel_count: Total number of pixels on the page
+            channel: Channel name ('cyan', 'magenta', 'yellow' or 'black')
+            stats: Statistics dictionary to update
+        """
+        mean = float(np.dot(counts, table)) / pixel_count
+        stats[f'{channel}_avg'] = mean
+        stats[f'{channel}_std'] = float(np.sqrt(np.dot(counts, (table - mean) ** 2) / pixel_count))
         
-        avg_tac = float(np.mean(tac))
-        max_tac = float(np.max(tac))
-        std_tac = float(np.std(tac))
+        if self.printer_profile:
+            # Use the array-based calculation for real ink consumption
+            # This accounts for actual pixel-level ink density rather than just averages
+            stats[f'ink_{channel}_ml'] = self._calculate_ink_volume_from_array(table, counts)
+    
+    def _calculate_page_statistics(self, stats: Dict[str, float], page_num: int) -> Dict:
+        """
+        Calculate statistical metrics for a page
         
-        # Calculate percentiles for better distribution understanding
-        tac_p50 = float(np.percentile(tac, 50))  # Median
-        tac_p95 = float(np.percentile(tac, 95))  # 95th percentile
-        tac_p99 = float(np.percentile(tac, 99))  # 99th percentile
+        Args:
+            stats: Scalar page statistics from _reduce_page_rgb()
+            page_num: Page number (1-indexed)
+        
+        Returns:
+            Dictionary with analysis results including ISO compliance and statistical metrics
+        """
+        max_tac = stats['tac_max']
         
         # Check ISO 12647 compliance
         iso_compliance = ISO12647Standard.check_compliance(max_tac, self.iso_process)
@@ -631,36 +1571,34 @@ class PDFInkAnalyzer:
         
         result = {
             'page': page_num,
-            'cyan_avg': round(avg_c, 2),
-            'magenta_avg': round(avg_m, 2),
-            'yellow_avg': round(avg_y, 2),
-            'black_avg': round(avg_k, 2),
-            'cyan_std': round(std_c, 2),
-            'magenta_std': round(std_m, 2),
-            'yellow_std': round(std_y, 2),
-            'black_std': round(std_k, 2),
-            'tac_avg': round(avg_tac, 2),
+            'cyan_avg': round(stats['cyan_avg'], 2),
+            'magenta_avg': round(stats['magenta_avg'], 2),
+            'yellow_avg': round(stats['yellow_avg'], 2),
+            'black_avg': round(stats['black_avg'], 2),
+            'cyan_std': round(stats['cyan_std'], 2),
+            'magenta_std': round(stats['magenta_std'], 2),
+            'yellow_std': round(stats['yellow_std'], 2),
+            'black_std': round(stats['black_std'], 2),
+            'tac_avg': round(stats['tac_avg'], 2),
             'tac_max': round(max_tac, 2),
-            'tac_std': round(std_tac, 2),
-            'tac_median': round(tac_p50, 2),
-            'tac_p95': round(tac_p95, 2),
-            'tac_p99': round(tac_p99, 2),
+            'tac_std': round(stats['tac_std'], 2),
+            'tac_median': round(stats['tac_median'], 2),
+            'tac_p95': round(stats['tac_p95'], 2),
+            'tac_p99': round(stats['tac_p99'], 2),
             'exceeds_280': exceeds_280,
             'exceeds_300': exceeds_300,
             'exceeds_320': exceeds_320,
             'iso_compliance': iso_compliance,
             'dot_gain_applied': self.apply_dot_gain,
-            'conversion_method': self.CONVERSION_METHOD_ADVANCED_GCR
+            'conversion_method': self.conversion_method
         }
         
-        # Calculate ink volumes if printer profile is provided
+        # Add ink volumes if printer profile is provided
         if self.printer_profile:
-            # Use the new array-based calculation for real ink consumption
-            # This accounts for actual pixel-level ink density rather than just averages
-            result['ink_cyan_ml'] = round(self._calculate_ink_volume_from_array(c), 4)
-            result['ink_magenta_ml'] = round(self._calculate_ink_volume_from_array(m), 4)
-            result['ink_yellow_ml'] = round(self._calculate_ink_volume_from_array(y), 4)
-            result['ink_black_ml'] = round(self._calculate_ink_volume_from_array(k), 4)
+            result['ink_cyan_ml'] = round(stats['ink_cyan_ml'], 4)
+            result['ink_magenta_ml'] = round(stats['ink_magenta_ml'], 4)
+            result['ink_yellow_ml'] = round(stats['ink_yellow_ml'], 4)
+            result['ink_black_ml'] = round(stats['ink_black_ml'], 4)
             result['ink_total_ml'] = round(
                 result['ink_cyan_ml'] + result['ink_magenta_ml'] + 
                 result['ink_yellow_ml'] + result['ink_black_ml'], 4
@@ -713,7 +1651,8 @@ class PDFInkAnalyzer:
         
         return ink_ml
     
-    def _calculate_ink_volume_from_array(self, coverage_array: np.ndarray) -> float:
+    def _calculate_ink_volume_from_array(self, coverage_array: np.ndarray,
+                                         pixel_counts: np.ndarray = None) -> float:
         """
         Calculate real ink volume in milliliters from actual pixel-level coverage data
         
@@ -729,6 +1668,8 @@ class PDFInkAnalyzer:
         
         Args:
             coverage_array: 2D numpy array with coverage values (0-100%) for a single channel
+            pixel_counts: Optional number of pixels having each coverage value, when
+                          coverage_array holds the distinct values of a histogram
         
         Returns:
             Ink volume in milliliters
@@ -741,14 +1682,17 @@ class PDFInkAnalyzer:
         MIN_PRINTABLE_THRESHOLD = 1.0  # 1%
         coverage_printable = np.where(coverage_array >= MIN_PRINTABLE_THRESHOLD, coverage_array, 0.0)
         
+        # Every pixel contributes in proportion to its coverage, so sum the
+        # coverage once and scale the total rather than each pixel
+        if pixel_counts is not None:
+            total_coverage = np.dot(coverage_printable, pixel_counts) / 100.0
+        else:
+            total_coverage = np.sum(coverage_printable) / 100.0
+        
         # Calculate based on printer type and ISO methodology
         if self.printer_profile.ink_per_drop_pl > 0:  # Inkjet (ISO/IEC 24711/24712)
-            # For each pixel, calculate the number of drops based on its coverage intensity
             # The number of drops scales with intensity: 50% coverage = 50% of max drops
-            drops_per_pixel_array = (coverage_printable / 100.0) * self.printer_profile.drops_per_pixel
-            
-            # Sum total drops across all pixels
-            total_drops = np.sum(drops_per_pixel_array)
+            total_drops = total_coverage * self.printer_profile.drops_per_pixel
             
             # Convert picoliters to milliliters
             ink_ml = (total_drops * self.printer_profile.ink_per_drop_pl) / self.PICOLITERS_TO_MILLILITERS
@@ -758,9 +1702,8 @@ class PDFInkAnalyzer:
             dpi = self.printer_profile.dpi
             pixels_per_sq_inch = dpi * dpi
             
-            # Calculate effective inked area: sum of all coverage values normalized
-            effective_inked_pixels = np.sum(coverage_printable) / 100.0
-            area_sq_inch = effective_inked_pixels / pixels_per_sq_inch
+            # Effective inked area: sum of all coverage values normalized
+            area_sq_inch = total_coverage / pixels_per_sq_inch
             area_sq_cm = area_sq_inch * self.SQ_INCH_TO_SQ_CM
             ink_ml = area_sq_cm * self.TONER_ML_PER_SQ_CM
         
@@ -776,22 +1719,27 @@ class PDFInkAnalyzer:
         Returns:
             Dictionary with summary statistics including ISO compliance
         """
-        if not self.results:
+        acc = self._acc
+        pages = acc['n']
+        if not pages:
             return {}
         
+        values = self._page_values[:pages]
+        averages = dict(zip(self.PAGE_SUMMARY_KEYS, values.sum(axis=0) / pages))
+        exceeding = self._page_exceeds[:pages].sum(axis=0)
+        
         summary = {
-            'total_pages': len(self.results),
+            'total_pages': pages,
             'copies': copies,
-            'cyan_avg_overall': round(np.mean([r['cyan_avg'] for r in self.results]), 2),
-            'magenta_avg_overall': round(np.mean([r['magenta_avg'] for r in self.results]), 2),
-            'yellow_avg_overall': round(np.mean([r['yellow_avg'] for r in self.results]), 2),
-            'black_avg_overall': round(np.mean([r['black_avg'] for r in self.results]), 2),
-            'tac_avg_overall': round(np.mean([r['tac_avg'] for r in self.results]), 2),
-            'tac_max_overall': round(max([r['tac_max'] for r in self.results]), 2),
-            'pages_exceeding_280': sum(1 for r in self.results if r['exceeds_280']),
-            'pages_exceeding_300': sum(1 for r in self.results if r['exceeds_300']),
-            'pages_exceeding_320': sum(1 for r in self.results if r['exceeds_320'])
+            'cyan_avg_overall': round(float(averages['cyan_avg']), 2),
+            'magenta_avg_overall': round(float(averages['magenta_avg']), 2),
+            'yellow_avg_overall': round(float(averages['yellow_avg']), 2),
+            'black_avg_overall': round(float(averages['black_avg']), 2),
+            'tac_avg_overall': round(float(averages['tac_avg']), 2),
+            'tac_max_overall': round(float(values[:, self.PAGE_SUMMARY_KEYS.index('tac_max')].max()), 2)
         }
+        for threshold, count in zip(self.LEGACY_TAC_THRESHOLDS, exceeding):
+            summary[f'pages_exceeding_{threshold}'] = int(count)
         
         # Add ISO 12647 compliance summary
         iso_process_info = ISO12647Standard.get_process_limit(self.iso_process)
@@ -800,21 +1748,18 @@ class PDFInkAnalyzer:
         summary['iso_12647_tac_limit'] = iso_process_info['tac_limit']
         
         # Count pages by compliance status
-        compliant_pages = sum(1 for r in self.results if r['iso_compliance']['status'] == 'compliant')
-        warning_pages = sum(1 for r in self.results if r['iso_compliance']['status'] == 'within_limits_caution')
-        exceeds_pages = sum(1 for r in self.results if r['iso_compliance']['status'] == 'exceeds_limit')
-        
-        summary['iso_compliant_pages'] = compliant_pages
-        summary['iso_warning_pages'] = warning_pages
-        summary['iso_exceeds_pages'] = exceeds_pages
+        summary['iso_compliant_pages'] = acc['compliant']
+        summary['iso_warning_pages'] = acc['within_limits_caution']
+        summary['iso_exceeds_pages'] = acc['exceeds_limit']
         
         # Add ink volume calculations if printer profile is provided
-        if self.printer_profile and 'ink_total_ml' in self.results[0]:
-            summary['ink_cyan_ml_total'] = round(sum(r['ink_cyan_ml'] for r in self.results) * copies, 4)
-            summary['ink_magenta_ml_total'] = round(sum(r['ink_magenta_ml'] for r in self.results) * copies, 4)
-            summary['ink_yellow_ml_total'] = round(sum(r['ink_yellow_ml'] for r in self.results) * copies, 4)
-            summary['ink_black_ml_total'] = round(sum(r['ink_black_ml'] for r in self.results) * copies, 4)
-            summary['ink_total_ml_all'] = round(sum(r['ink_total_ml'] for r in self.results) * copies, 4)
+        if self.printer_profile and acc['has_ink']:
+            ink = dict(zip(self.INK_KEYS, self._page_ink[:pages].sum(axis=0).tolist()))
+            summary['ink_cyan_ml_total'] = round(ink['ink_cyan_ml'] * copies, 4)
+            summary['ink_magenta_ml_total'] = round(ink['ink_magenta_ml'] * copies, 4)
+            summary['ink_yellow_ml_total'] = round(ink['ink_yellow_ml'] * copies, 4)
+            summary['ink_black_ml_total'] = round(ink['ink_black_ml'] * copies, 4)
+            summary['ink_total_ml_all'] = round(ink['ink_total_ml'] * copies, 4)
             summary['printer_profile'] = self.printer_profile.name
             summary['iso_standard_ink_calculation'] = self.printer_profile.iso_standard
             
@@ -825,7 +1770,7 @@ class PDFInkAnalyzer:
                     summary['ink_magenta_ml_total'],
                     summary['ink_yellow_ml_total'],
                     summary['ink_black_ml_total'],
-                    len(self.results),
+                    pages,
                     copies
                 )
                 summary.update(cost_info)
@@ -842,44 +1787,56 @@ class PDFInkAnalyzer:
         if not self.results:
             raise ValueError("No results to export. Run analyze() first.")
         
-        # Determine fieldnames based on whether ink volumes are present
+        fieldnames = self._csv_fieldnames('ink_total_ml' in self.results[0])
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            # Rows are produced one at a time, so no second copy of the results is held
+            writer.writerows(self._csv_row(result, fieldnames) for result in self.results)
+        
+        print(f"Results exported to CSV: {output_path}", file=sys.stderr)
+    
+    def _csv_fieldnames(self, with_ink: bool) -> List[str]:
+        """
+        CSV columns for page results
+        
+        Args:
+            with_ink: Include the ink volume columns
+        
+        Returns:
+            List of column names
+        """
         fieldnames = [
             'page', 'cyan_avg', 'magenta_avg', 'yellow_avg', 'black_avg',
             'tac_avg', 'tac_max', 'exceeds_280', 'exceeds_300', 'exceeds_320'
         ]
         
         # Add ink volume fields if present
-        if self.results and 'ink_total_ml' in self.results[0]:
+        if with_ink:
             fieldnames.extend([
                 'ink_cyan_ml', 'ink_magenta_ml', 'ink_yellow_ml', 
                 'ink_black_ml', 'ink_total_ml', 'iso_standard_used'
             ])
         
         # Add ISO compliance fields
-        fieldnames.extend([
-            'iso_compliance_status', 'iso_compliance_severity', 
-            'iso_tac_limit', 'iso_process_description'
-        ])
-        
-        # Prepare rows with flattened ISO compliance data
-        rows = []
-        for result in self.results:
-            row = {k: v for k, v in result.items() if k != 'iso_compliance'}
-            # Flatten ISO compliance
-            if 'iso_compliance' in result:
-                iso = result['iso_compliance']
-                row['iso_compliance_status'] = iso['status']
-                row['iso_compliance_severity'] = iso['severity']
-                row['iso_tac_limit'] = iso['tac_limit']
-                row['iso_process_description'] = iso['description']
-            rows.append(row)
+        fieldnames.extend(self.CSV_ISO_FIELDS)
+        return fieldnames
+    
+    def _csv_row(self, result: Dict, fieldnames: List[str]) -> List:
+        """
+        Flatten a page result into a CSV row in fieldname order
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(rows)
+        Args:
+            result: Dictionary returned by _calculate_page_statistics()
+            fieldnames: Columns from _csv_fieldnames()
         
-        print(f"Results exported to CSV: {output_path}", file=sys.stderr)
+        Returns:
+            List of column values
+        """
+        iso = result.get('iso_compliance', {})
+        return [iso.get(self.CSV_ISO_FIELDS[field], '') if field in self.CSV_ISO_FIELDS else result.get(field, '')
+                for field in fieldnames]
     
     def export_to_json(self, output_path: str, include_summary: bool = True, copies: int = 1):
         """
@@ -905,11 +1862,30 @@ class PDFInkAnalyzer:
         if include_summary:
             output['summary'] = self.get_summary(copies)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # Same document as json.dump() below, serialized in C
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
         
         print(f"Results exported to JSON: {output_path}", file=sys.stderr)
     
+    def append_jsonl_summary(self, output_path: str, copies: int = 1):
+        """
+        Append the summary statistics to a JSON Lines file written with stream_jsonl
+        
+        The summary is written as one line holding an object with a single
+        'summary' key, so readers can tell it apart from the page lines.
+        
+        Args:
+            output_path: Path to the JSON Lines file
+            copies: Number of copies for ink calculation (default: 1)
+        """
+        with open(output_path, 'ab') as f:
+            f.write(_json_line({'summary': self.get_summary(copies)}))
+    
     def print_results(self, copies: int = 1):
         """
         Print results to console in a formatted way with ISO compliance information
@@ -921,116 +1897,236 @@ class PDFInkAnalyzer:
             print("No results available. Run analyze() first.")
             return
         
-        print("\n" + "=" * 80)
-        print(f"PDF Ink Coverage Analysis: {self.pdf_path.name}")
+        # Collect the report and write it at once rather than line by line
+        report = []
+        emit = report.append
+        
+        emit("\n" + "=" * 80)
+        emit(f"PDF Ink Coverage Analysis: {self.pdf_path.name}")
         if self.printer_profile:
-            print(f"Printer Profile: {self.printer_profile.description}")
-            print(f"Ink Calculation Standard: {self.printer_profile.iso_standard}")
+            emit(f"Printer Profile: {self.printer_profile.description}")
+            emit(f"Ink Calculation Standard: {self.printer_profile.iso_standard}")
         
         # Print ISO 12647 process information
         iso_process_info = ISO12647Standard.get_process_limit(self.iso_process)
-        print(f"TAC Compliance Standard: {iso_process_info['description']}")
-        print(f"TAC Limit: {iso_process_info['tac_limit']}% (Warning at {iso_process_info['warning_threshold']}%)")
+        emit(f"TAC Compliance Standard: {iso_process_info['description']}")
+        emit(f"TAC Limit: {iso_process_info['tac_limit']}% (Warning at {iso_process_info['warning_threshold']}%)")
         
         if copies > 1:
-            print(f"Calculating for {copies} copies")
-        print("=" * 80)
+            emit(f"Calculating for {copies} copies")
+        emit("=" * 80)
         
         for result in self.results:
-            print(f"\nPage {result['page']}:")
-            print(f"  Cyan (C):    {result['cyan_avg']:6.2f}% ± {result.get('cyan_std', 0):5.2f}%")
-            print(f"  Magenta (M): {result['magenta_avg']:6.2f}% ± {result.get('magenta_std', 0):5.2f}%")
-            print(f"  Yellow (Y):  {result['yellow_avg']:6.2f}% ± {result.get('yellow_std', 0):5.2f}%")
-            print(f"  Black (K):   {result['black_avg']:6.2f}% ± {result.get('black_std', 0):5.2f}%")
-            print(f"  TAC Average: {result['tac_avg']:6.2f}%")
-            print(f"  TAC Maximum: {result['tac_max']:6.2f}%")
-            print(f"  TAC Median:  {result.get('tac_median', 0):6.2f}%")
-            print(f"  TAC 95th %:  {result.get('tac_p95', 0):6.2f}%")
+            emit(f"\nPage {result['page']}:")
+            emit(f"  Cyan (C):    {result['cyan_avg']:6.2f}% ± {result.get('cyan_std', 0):5.2f}%")
+            emit(f"  Magenta (M): {result['magenta_avg']:6.2f}% ± {result.get('magenta_std', 0):5.2f}%")
+            emit(f"  Yellow (Y):  {result['yellow_avg']:6.2f}% ± {result.get('yellow_std', 0):5.2f}%")
+            emit(f"  Black (K):   {result['black_avg']:6.2f}% ± {result.get('black_std', 0):5.2f}%")
+            emit(f"  TAC Average: {result['tac_avg']:6.2f}%")
+            emit(f"  TAC Maximum: {result['tac_max']:6.2f}%")
+            emit(f"  TAC Median:  {result.get('tac_median', 0):6.2f}%")
+            emit(f"  TAC 95th %:  {result.get('tac_p95', 0):6.2f}%")
             
             # Print advanced conversion info if available
             if result.get('conversion_method') == self.CONVERSION_METHOD_ADVANCED_GCR:
-                print(f"  Conversion:  Advanced GCR (Gray Component Replacement)")
+                emit(f"  Conversion:  Advanced GCR (Gray Component Replacement)")
+            elif result.get('conversion_method') == self.CONVERSION_METHOD_DEVICE_CMYK:
+                emit(f"  Conversion:  Device CMYK (rendered by MuPDF)")
             if result.get('dot_gain_applied'):
-                print(f"  Dot Gain:    Applied ({self.DOT_GAIN_COMPENSATION.get(self.iso_process, 0.15)*100:.0f}%)")
+                emit(f"  Dot Gain:    Applied ({self.DOT_GAIN_COMPENSATION.get(self.iso_process, 0.15)*100:.0f}%)")
             
             # Print ISO compliance status
             iso_comp = result['iso_compliance']
-            if iso_comp['status'] == 'compliant':
-                print(f"  ✓ ISO 12647 Compliant (TAC ≤ {iso_comp['warning_threshold']}%)")
-            elif iso_comp['status'] == 'within_limits_caution':
-                print(f"  ⚠️  Within ISO limits but near threshold (TAC ≤ {iso_comp['tac_limit']}%)")
-            else:
-                print(f"  ❌ Exceeds ISO 12647 limit (TAC > {iso_comp['tac_limit']}%)")
+            message = self.ISO_STATUS_MESSAGES.get(iso_comp['status'], self.ISO_STATUS_MESSAGES['exceeds_limit'])
+            emit(message.format(**iso_comp))
             
             # Print ink volumes if available
             if 'ink_total_ml' in result:
-                print(f"\n  Ink Volume per copy (calculated using {result['iso_standard_used']}):")
-                print(f"    Cyan:    {result['ink_cyan_ml']:8.4f} mL")
-                print(f"    Magenta: {result['ink_magenta_ml']:8.4f} mL")
-                print(f"    Yellow:  {result['ink_yellow_ml']:8.4f} mL")
-                print(f"    Black:   {result['ink_black_ml']:8.4f} mL")
-                print(f"    Total:   {result['ink_total_ml']:8.4f} mL")
+                emit(f"\n  Ink Volume per copy (calculated using {result['iso_standard_used']}):")
+                emit(f"    Cyan:    {result['ink_cyan_ml']:8.4f} mL")
+                emit(f"    Magenta: {result['ink_magenta_ml']:8.4f} mL")
+                emit(f"    Yellow:  {result['ink_yellow_ml']:8.4f} mL")
+                emit(f"    Black:   {result['ink_black_ml']:8.4f} mL")
+                emit(f"    Total:   {result['ink_total_ml']:8.4f} mL")
             
             # Keep backward-compatible warnings
             if result['exceeds_320']:
-                print(f"  ⚠️  WARNING: TAC exceeds 320% limit!")
+                emit(f"  ⚠️  WARNING: TAC exceeds 320% limit!")
             elif result['exceeds_300']:
-                print(f"  ⚠️  WARNING: TAC exceeds 300% limit!")
+                emit(f"  ⚠️  WARNING: TAC exceeds 300% limit!")
             elif result['exceeds_280']:
-                print(f"  ⚠️  CAUTION: TAC exceeds 280% limit!")
+                emit(f"  ⚠️  CAUTION: TAC exceeds 280% limit!")
         
         summary = self.get_summary(copies)
-        print("\n" + "-" * 80)
-        print("Overall Summary:")
-        print("-" * 80)
-        print(f"Total Pages:           {summary['total_pages']}")
+        emit("\n" + "-" * 80)
+        emit("Overall Summary:")
+        emit("-" * 80)
+        emit(f"Total Pages:           {summary['total_pages']}")
         if copies > 1:
-            print(f"Number of Copies:      {copies}")
-        print(f"Cyan Average:          {summary['cyan_avg_overall']:6.2f}%")
-        print(f"Magenta Average:       {summary['magenta_avg_overall']:6.2f}%")
-        print(f"Yellow Average:        {summary['yellow_avg_overall']:6.2f}%")
-        print(f"Black Average:         {summary['black_avg_overall']:6.2f}%")
-        print(f"TAC Average Overall:   {summary['tac_avg_overall']:6.2f}%")
-        print(f"TAC Maximum Overall:   {summary['tac_max_overall']:6.2f}%")
-        print(f"\nISO 12647 Compliance:")
-        print(f"  Process Type:        {summary['iso_12647_description']}")
-        print(f"  TAC Limit:           {summary['iso_12647_tac_limit']}%")
-        print(f"  Compliant Pages:     {summary['iso_compliant_pages']}")
-        print(f"  Warning Pages:       {summary['iso_warning_pages']}")
-        print(f"  Exceeding Pages:     {summary['iso_exceeds_pages']}")
-        print(f"\nLegacy TAC Thresholds:")
-        print(f"  Pages exceeding 280%:  {summary['pages_exceeding_280']}")
-        print(f"  Pages exceeding 300%:  {summary['pages_exceeding_300']}")
-        print(f"  Pages exceeding 320%:  {summary['pages_exceeding_320']}")
+            emit(f"Number of Copies:      {copies}")
+        emit(f"Cyan Average:          {summary['cyan_avg_overall']:6.2f}%")
+        emit(f"Magenta Average:       {summary['magenta_avg_overall']:6.2f}%")
+        emit(f"Yellow Average:        {summary['yellow_avg_overall']:6.2f}%")
+        emit(f"Black Average:         {summary['black_avg_overall']:6.2f}%")
+        emit(f"TAC Average Overall:   {summary['tac_avg_overall']:6.2f}%")
+        emit(f"TAC Maximum Overall:   {summary['tac_max_overall']:6.2f}%")
+        emit(f"\nISO 12647 Compliance:")
+        emit(f"  Process Type:        {summary['iso_12647_description']}")
+        emit(f"  TAC Limit:           {summary['iso_12647_tac_limit']}%")
+        emit(f"  Compliant Pages:     {summary['iso_compliant_pages']}")
+        emit(f"  Warning Pages:       {summary['iso_warning_pages']}")
+        emit(f"  Exceeding Pages:     {summary['iso_exceeds_pages']}")
+        emit(f"\nLegacy TAC Thresholds:")
+        emit(f"  Pages exceeding 280%:  {summary['pages_exceeding_280']}")
+        emit(f"  Pages exceeding 300%:  {summary['pages_exceeding_300']}")
+        emit(f"  Pages exceeding 320%:  {summary['pages_exceeding_320']}")
         
         # Print total ink volumes if available
         if 'ink_total_ml_all' in summary:
-            print(f"\nTotal Ink Volume ({copies} {'copy' if copies == 1 else 'copies'}):")
-            print(f"  Calculation Method:  {summary['iso_standard_ink_calculation']}")
-            print(f"  Cyan:    {summary['ink_cyan_ml_total']:8.4f} mL")
-            print(f"  Magenta: {summary['ink_magenta_ml_total']:8.4f} mL")
-            print(f"  Yellow:  {summary['ink_yellow_ml_total']:8.4f} mL")
-            print(f"  Black:   {summary['ink_black_ml_total']:8.4f} mL")
-            print(f"  Total:   {summary['ink_total_ml_all']:8.4f} mL")
+            emit(f"\nTotal Ink Volume ({copies} {'copy' if copies == 1 else 'copies'}):")
+            emit(f"  Calculation Method:  {summary['iso_standard_ink_calculation']}")
+            emit(f"  Cyan:    {summary['ink_cyan_ml_total']:8.4f} mL")
+            emit(f"  Magenta: {summary['ink_magenta_ml_total']:8.4f} mL")
+            emit(f"  Yellow:  {summary['ink_yellow_ml_total']:8.4f} mL")
+            emit(f"  Black:   {summary['ink_black_ml_total']:8.4f} mL")
+            emit(f"  Total:   {summary['ink_total_ml_all']:8.4f} mL")
             
             # Print cartridge consumption and costs if available
             if 'total_cost' in summary:
-                print(f"\nCartridge Consumption and Cost ({copies} {'copy' if copies == 1 else 'copies'}):")
+                emit(f"\nCartridge Consumption and Cost ({copies} {'copy' if copies == 1 else 'copies'}):")
                 if 'cyan_cartridges' in summary:
-                    print(f"  Cyan:    {summary['cyan_cartridges']:8.4f} cartridges = ${summary['cyan_cost']:8.2f}")
+                    emit(f"  Cyan:    {summary['cyan_cartridges']:8.4f} cartridges = ${summary['cyan_cost']:8.2f}")
                 if 'magenta_cartridges' in summary:
-                    print(f"  Magenta: {summary['magenta_cartridges']:8.4f} cartridges = ${summary['magenta_cost']:8.2f}")
+                    emit(f"  Magenta: {summary['magenta_cartridges']:8.4f} cartridges = ${summary['magenta_cost']:8.2f}")
                 if 'yellow_cartridges' in summary:
-                    print(f"  Yellow:  {summary['yellow_cartridges']:8.4f} cartridges = ${summary['yellow_cost']:8.2f}")
+                    emit(f"  Yellow:  {summary['yellow_cartridges']:8.4f} cartridges = ${summary['yellow_cost']:8.2f}")
                 if 'black_cartridges' in summary:
-                    print(f"  Black:   {summary['black_cartridges']:8.4f} cartridges = ${summary['black_cost']:8.2f}")
-                print(f"  Total Cost: ${summary['total_cost']:8.2f}")
+                    emit(f"  Black:   {summary['black_cartridges']:8.4f} cartridges = ${summary['black_cost']:8.2f}")
+                emit(f"  Total Cost: ${summary['total_cost']:8.2f}")
         
-        print("=" * 80 + "\n")
+        emit("=" * 80 + "\n")
+        print("\n".join(report))
+
 
+def _json_line(obj) -> bytes:
+    """Serialize obj as one line of JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n'
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
 
-def main():
-    """Main CLI entry point"""
+
+# Documents kept open by _open_document(), least recently used first. Each entry
+# is [document, number of analyzers holding it].
+_open_documents = {}
+_open_documents_lock = threading.Lock()
+_OPEN_DOCUMENT_LIMIT = 16
+
+
+def _open_document(key: Tuple[str, int, int, int]) -> List:
+    """
+    Open a PDF once and keep it open for later analyses of the same file
+    
+    Reopening re-parses the document's cross-reference table, which dominates
+    repeated analyses of a long PDF (other DPIs, profiles or analyzer instances).
+    The key is (path, mtime_ns, size, thread_id): the modification time and size
+    invalidate the entry when the file changes, and the thread id keeps each open
+    document to one thread, as MuPDF requires. The caller holds the returned
+    [document, holders] entry until it passes it to _release_document(). Entries
+    beyond _OPEN_DOCUMENT_LIMIT are forgotten; their documents are closed when
+    released or garbage collected.
+    """
+    with _open_documents_lock:
+        entry = _open_documents.pop(key, None)
+        if entry is None:
+            entry = [fitz.open(key[0]), 0]
+        entry[1] += 1
+        _open_documents[key] = entry
+        while len(_open_documents) > _OPEN_DOCUMENT_LIMIT:
+            del _open_documents[next(iter(_open_documents))]
+        return entry
+
+
+def _release_document(key: Tuple[str, int, int, int], entry: List):
+    """Release an entry from _open_document(), closing its document once nobody holds it"""
+    with _open_documents_lock:
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        if _open_documents.get(key) is entry:
+            del _open_documents[key]
+    entry[0].close()
+
+
+# Per-process state for parallel page analysis (see PDFInkAnalyzer.analyze)
+_worker_analyzer = None
+_worker_doc = None
+_worker_matrix = None
+
+
+def _init_page_worker(analyzer: PDFInkAnalyzer):
+    """Open the analyzer's PDF once in a worker process"""
+    global _worker_analyzer, _worker_doc, _worker_matrix
+    _worker_analyzer = analyzer
+    _worker_doc = fitz.open(analyzer.pdf_path)
+    if not analyzer.anti_aliasing:
+        fitz.TOOLS.set_aa_level(0)
+    _worker_matrix = analyzer._render_matrix()
+
+
+def _analyze_page_in_worker(page_num: int) -> Dict:
+    """Render and analyze one page in a worker process"""
+    return _worker_analyzer._analyze_page(_worker_doc, page_num, _worker_matrix)
+
+
+def _analyze_file(pdf_file, args, printer_profile, cartridge_config, cache_dir, csv_file, json_file,
+                  jsonl_file):
+    """Analyze one PDF as requested on the command line and report or export the results"""
+    # CSV rows, JSON Lines and cache entries are written as pages complete, so
+    # per-page results are only needed for the console table and the JSON export
+    analyzer = PDFInkAnalyzer(
+        pdf_file, 
+        dpi=72 if args.fast else args.dpi, 
+        printer_profile=printer_profile,
+        iso_process=args.iso_process,
+        cartridge_config=cartridge_config,
+        conversion_method=args.conversion_method,
+        workers=args.workers,
+        adaptive_dpi=args.adaptive_dpi,
+        adaptive_tolerance=args.adaptive_tolerance,
+        tac_max_window=args.tac_max_window,
+        show_progress=not args.quiet,
+        pages=args.pages,
+        anti_aliasing=not args.fast,
+        cache_dir=cache_dir,
+        stream_csv=csv_file,
+        stream_jsonl=jsonl_file,
+        keep_results=bool(not args.quiet or json_file)
+    )
+    try:
+        analyzer.analyze()
+    finally:
+        # Do not keep every file of a batch open until the process exits
+        analyzer.close()
+    
+    # Print results to console unless quiet mode
+    if not args.quiet:
+        analyzer.print_results(copies=args.copies)
+    
+    # Export to JSON if requested
+    if json_file:
+        analyzer.export_to_json(json_file, include_summary=not args.no_summary, copies=args.copies)
+    
+    if jsonl_file and not args.no_summary:
+        analyzer.append_jsonl_summary(jsonl_file, copies=args.copies)
+
+
+def main(argv: List[str] = None):
+    """
+    Main CLI entry point
+    
+    Args:
+        argv: Command line arguments without the program name (default: sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description='Analyze CMYK ink coverage in PDF files with ISO/IEC standard compliance',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1054,9 +2150,27 @@ Examples:
   # Export to JSON with summary
   python pdf_ink_analyzer.py document.pdf --json output.json
   
+  # Stream one JSON object per page for other tools to consume
+  python pdf_ink_analyzer.py document.pdf --jsonl output.jsonl --quiet
+  
   # Use higher resolution for more accurate analysis
   python pdf_ink_analyzer.py document.pdf --dpi 300 --json output.json
   
+  # Quick estimate: 72 DPI without anti-aliasing
+  python pdf_ink_analyzer.py document.pdf --fast
+  
+  # Render at 72 DPI first and only re-render pages that need the full resolution
+  python pdf_ink_analyzer.py document.pdf --dpi 300 --adaptive-dpi
+  
+  # Analyze only some pages
+  python pdf_ink_analyzer.py document.pdf --pages 1-10,20
+  
+  # Analyze every PDF in a directory tree, writing one CSV file per PDF
+  python pdf_ink_analyzer.py documents/ --recursive --csv reports/
+  
+  # Analyze pages in parallel worker processes
+  python pdf_ink_analyzer.py document.pdf --workers 4
+  
 Available printer profiles (with ISO/IEC standard methodology):
   - inkjet_standard: Standard inkjet printer (4pl drops, 600 DPI, ISO/IEC 24711) [DEFAULT]
   - inkjet_photo: Photo inkjet printer (2pl drops, 1200 DPI, ISO/IEC 24711)
@@ -1073,9 +2187,20 @@ Available ISO 12647 printing processes:
         """
     )
     
-    parser.add_argument('pdf_file', help='Path to PDF file to analyze')
-    parser.add_argument('--dpi', type=int, default=150,
-                        help='Resolution for rendering pages (default: 150)')
+    parser.add_argument('pdf_file', help='Path to PDF file, or directory of PDF files, to analyze')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='When analyzing a directory, include PDF files in its subdirectories')
+    resolution = parser.add_mutually_exclusive_group()
+    resolution.add_argument('--dpi', type=int, default=150,
+                            help='Resolution for rendering pages; cost grows with its square (default: 150)')
+    resolution.add_argument('--fast', action='store_true',
+                            help='Render at 72 DPI without anti-aliasing; coverage means typically move by a fraction of a percent')
+    parser.add_argument('--adaptive-dpi', action='store_true',
+                        help='Analyze pages at 72 DPI first and only re-render at --dpi when channel means are not precise enough')
+    parser.add_argument('--adaptive-tolerance', type=float, default=0.1, metavar='PCT',
+                        help='Largest standard error of a channel mean accepted from the 72 DPI pass, in %% (default: 0.1)')
+    parser.add_argument('--tac-max-window', type=int, default=1, metavar='N',
+                        help='Report maximum TAC as the largest mean over N x N pixel blocks, ignoring isolated pixels (default: 1)')
     parser.add_argument('--printer-profile', 
                         choices=list(PrinterProfile.PROFILES.keys()),
                         default='inkjet_standard',
@@ -1084,20 +2209,36 @@ Available ISO 12647 printing processes:
                         choices=list(ISO12647Standard.PROCESS_TAC_LIMITS.keys()),
                         default='sheet_fed_coated',
                         help='ISO 12647 printing process type for TAC compliance checking (default: sheet_fed_coated)')
+    parser.add_argument('--conversion-method',
+                        choices=list(PDFInkAnalyzer.CONVERSION_METHODS),
+                        default=PDFInkAnalyzer.CONVERSION_METHOD_ADVANCED_GCR,
+                        help='RGB to CMYK conversion: advanced_gcr converts rendered RGB, device_cmyk renders CMYK directly (default: advanced_gcr)')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='Number of worker processes analyzing pages in parallel (default: 1)')
+    parser.add_argument('--pages', metavar='RANGES',
+                        help='Pages to analyze, such as 1-10,20,30- (default: all pages)')
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument('--cache-dir', metavar='DIR',
+                       help='Directory caching results of earlier analyses (default: $XDG_CACHE_HOME/pdf-ink-analyzer)')
+    cache.add_argument('--no-cache', action='store_true',
+                       help='Always analyze the PDF, without reading or writing cached results')
     parser.add_argument('--copies', type=int, default=1,
                         help='Number of copies to calculate ink for (default: 1)')
     parser.add_argument('--cartridge-config', metavar='FILE',
                         help='Path to cartridge configuration JSON file for cost calculation (optional)')
     parser.add_argument('--csv', metavar='FILE',
-                        help='Export results to CSV file')
+                        help='Export results to CSV file (a directory of CSV files when analyzing a directory)')
     parser.add_argument('--json', metavar='FILE',
-                        help='Export results to JSON file')
+                        help='Export results to JSON file (a directory of JSON files when analyzing a directory)')
+    parser.add_argument('--jsonl', metavar='FILE',
+                        help='Write one line of JSON per page to FILE as pages are analyzed, followed by a summary line '
+                             '(a directory of JSON Lines files when analyzing a directory)')
     parser.add_argument('--no-summary', action='store_true',
-                        help='Do not include summary in JSON output')
+                        help='Do not include summary in JSON or JSON Lines output')
     parser.add_argument('--quiet', '-q', action='store_true',
-                        help='Do not print results to console')
+                        help='Do not print progress or results to console')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Validate copies
     if args.copies < 1:
@@ -1113,32 +2254,55 @@ Available ISO 12647 printing processes:
         if args.cartridge_config:
             cartridge_config = CartridgeConfig(args.cartridge_config)
         
-        # Create analyzer and run analysis
-        analyzer = PDFInkAnalyzer(
-            args.pdf_file, 
-            dpi=args.dpi, 
-            printer_profile=printer_profile,
-            iso_process=args.iso_process,
-            cartridge_config=cartridge_config
-        )
-        analyzer.analyze()
-        
-        # Print results to console unless quiet mode
-        if not args.quiet:
-            analyzer.print_results(copies=args.copies)
-        
-        # Export to CSV if requested
-        if args.csv:
-            analyzer.export_to_csv(args.csv)
-        
-        # Export to JSON if requested
-        if args.json:
-            analyzer.export_to_json(args.json, include_summary=not args.no_summary, copies=args.copies)
-        
         # If neither export option specified and quiet mode, remind user
-        if args.quiet and not args.csv and not args.json:
+        if args.quiet and not args.csv and not args.json and not args.jsonl:
             print("Warning: Quiet mode enabled but no export format specified.", file=sys.stderr)
-            print("Use --csv or --json to export results.", file=sys.stderr)
+            print("Use --csv, --json or --jsonl to export results.", file=sys.stderr)
+        
+        # Cache results per user unless told otherwise
+        cache_dir = None
+        if not args.no_cache:
+            cache_dir = args.cache_dir or Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'pdf-ink-analyzer'
+        
+        # A directory is analyzed file by file in this process, so the
+        # heavy imports, the profile and the cartridge configuration are
+        # loaded once for the whole batch
+        source = Path(args.pdf_file)
+        if not source.is_dir():
+            _analyze_file(args.pdf_file, args, printer_profile, cartridge_config, cache_dir,
+                          args.csv, args.json, args.jsonl)
+            return
+        
+        pdf_files = sorted(path for path in (source.rglob('*') if args.recursive else source.iterdir())
+                           if path.suffix.lower() == '.pdf' and path.is_file())
+        if not pdf_files:
+            raise ValueError(f"No PDF files found in {source}")
+        
+        failed = 0
+        for pdf_file in pdf_files:
+            relative = pdf_file.relative_to(source)
+            csv_file = json_file = jsonl_file = None
+            if args.csv:
+                csv_file = Path(args.csv) / relative.with_suffix('.csv')
+                csv_file.parent.mkdir(parents=True, exist_ok=True)
+            if args.json:
+                json_file = Path(args.json) / relative.with_suffix('.json')
+                json_file.parent.mkdir(parents=True, exist_ok=True)
+            if args.jsonl:
+                jsonl_file = Path(args.jsonl) / relative.with_suffix('.jsonl')
+                jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+            if not args.quiet:
+                print(f"\n=== {relative} ===")
+            try:
+                _analyze_file(str(pdf_file), args, printer_profile, cartridge_config, cache_dir,
+                              csv_file, json_file, jsonl_file)
+            except Exception as e:
+                print(f"Error: {pdf_file}: {e}", file=sys.stderr)
+                failed += 1
+        
+        if failed:
+            print(f"Error: {failed} of {len(pdf_files)} files could not be analyzed", file=sys.stderr)
+            sys.exit(1)
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
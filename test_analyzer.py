@@ -5,16 +5,20 @@ Test script for PDF Ink Coverage Analyzer
 Creates a simple test PDF with known color patterns and verifies the analyzer works correctly.
 """
 
+import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 try:
     import fitz  # PyMuPDF
+    import numpy as np
 except ImportError:
     print("Error: PyMuPDF not installed. Run: pip install -r requirements.txt")
     sys.exit(1)
 
-from pdf_ink_analyzer import PDFInkAnalyzer, PrinterProfile
+from pdf_ink_analyzer import PDFInkAnalyzer, PrinterProfile, main
 
 
 def create_test_pdf(output_path: str = "/tmp/test_document.pdf"):
@@ -156,6 +160,201 @@ def run_test():
         assert 'ink_total_ml' in results_test[0], f"Profile {profile_name} should calculate ink"
         print(f"✓ Profile '{profile_name}' works correctly")
     
+    # Test parallel page analysis
+    print("\n12. Testing parallel page analysis (2 workers)...")
+    analyzer_parallel = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                       workers=2)
+    results_parallel = analyzer_parallel.analyze()
+    assert results_parallel == results_with_profile, "Parallel results should match sequential results"
+    print("✓ Parallel analysis matches sequential analysis")
+    
+    # Test summary-only analysis (no per-page results kept)
+    print("\n13. Testing summary without keeping per-page results...")
+    analyzer_summary_only = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                           keep_results=False)
+    analyzer_summary_only.analyze()
+    assert analyzer_summary_only.results == [], "Per-page results should not be kept"
+    assert analyzer_summary_only.get_summary(copies=50) == summary, "Summary should match full analysis"
+    print("✓ Summary matches full analysis")
+    
+    # Test direct CMYK rendering
+    print("\n14. Testing device CMYK conversion...")
+    analyzer_device = PDFInkAnalyzer(test_pdf, dpi=150, conversion_method='device_cmyk')
+    results_device = analyzer_device.analyze()
+    assert results_device[0]['magenta_avg'] > 5, "Page 1 should have magenta"
+    assert results_device[0]['yellow_avg'] > 5, "Page 1 should have yellow"
+    assert results_device[0]['cyan_avg'] < 5, "Page 1 should have low cyan"
+    assert results_device[0]['conversion_method'] == 'device_cmyk', "Conversion method should be reported"
+    print("✓ Device CMYK conversion works correctly")
+    
+    # Test adaptive DPI
+    print("\n15. Testing adaptive DPI...")
+    analyzer_adaptive = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                       adaptive_dpi=True)
+    results_adaptive = analyzer_adaptive.analyze()
+    for page_adaptive, page_full in zip(results_adaptive, results_with_profile):
+        assert page_adaptive['render_dpi'] in (72, 150), "Render DPI should be reported"
+        assert abs(page_adaptive['magenta_avg'] - page_full['magenta_avg']) < 0.5, "Adaptive coverage should match"
+        assert abs(page_adaptive['ink_total_ml'] - page_full['ink_total_ml']) < 0.001, "Adaptive ink volume should match"
+    print("✓ Adaptive DPI matches full resolution analysis")
+    
+    # Test that blank pages are skipped without changing results
+    print("\n16. Testing blank page detection...")
+    blank_pdf = "/tmp/test_blank_document.pdf"
+    doc = fitz.open(test_pdf)
+    doc.new_page(width=595, height=842)
+    doc.save(blank_pdf)
+    doc.close()
+    analyzer_blank = PDFInkAnalyzer(blank_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'))
+    results_blank = analyzer_blank.analyze()
+    assert results_blank[:3] == results_with_profile, "Non-blank pages should be unaffected"
+    assert results_blank[3]['tac_max'] == 0 and results_blank[3]['ink_total_ml'] == 0, "Blank page should have no ink"
+    rendered_white = analyzer_blank._analyze_page_rgb(np.full((100, 100, 3), 255, dtype=np.uint8), 4)
+    assert results_blank[3] == rendered_white, "Blank page should match a rendered white page"
+    print("✓ Blank pages are detected without rendering")
+    
+    # Test that a rewritten PDF is reopened rather than served from the document cache
+    print("\n17. Testing document reuse across analyses...")
+    assert analyzer_blank.analyze() == results_blank, "Repeated analysis should give the same results"
+    doc = fitz.open(test_pdf)
+    doc.new_page(width=595, height=842)
+    doc.new_page(width=595, height=842)
+    doc.save(blank_pdf)
+    doc.close()
+    assert len(analyzer_blank.analyze()) == 5, "Rewritten PDF should be reopened"
+    reused_doc = analyzer_blank._doc_entry[0]
+    analyzer_other = PDFInkAnalyzer(blank_pdf, dpi=72)
+    analyzer_other.analyze()
+    assert analyzer_other._doc_entry[0] is reused_doc, "Other analyzers should share the open document"
+    analyzer_blank.close()
+    assert not reused_doc.is_closed, "close() should keep documents other analyzers hold"
+    assert len(analyzer_other.analyze()) == 5, "Other analyzers should keep working after close()"
+    analyzer_other.close()
+    assert reused_doc.is_closed, "close() should close the document once nobody holds it"
+    assert len(analyzer_blank.analyze()) == 5, "Analysis after close() should reopen the PDF"
+    print("✓ Open documents are reused until the file changes")
+
+    # Test windowed TAC maximum
+    print("\n18. Testing TAC maximum over pixel blocks...")
+    analyzer_window = PDFInkAnalyzer(test_pdf, dpi=150, tac_max_window=4)
+    speck = np.full((100, 100, 3), 255, dtype=np.uint8)
+    speck[50, 50] = 0
+    speck_pixel = analyzer._analyze_page_rgb(speck, 1)
+    speck_window = analyzer_window._analyze_page_rgb(speck, 1)
+    assert abs(speck_window['tac_max'] - speck_pixel['tac_max'] / 16) < 0.01, "Isolated pixel should be averaged"
+    assert speck_window['tac_avg'] == speck_pixel['tac_avg'], "Window should only change the maximum"
+    for page_window, page_pixel in zip(analyzer_window.analyze(), results):
+        assert abs(page_window['tac_max'] - page_pixel['tac_max']) < 0.01, "Solid areas should keep their maximum"
+    print("✓ TAC maximum ignores isolated pixels")
+
+    # Test page selection
+    print("\n19. Testing page range selection...")
+    analyzer_pages = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                    pages='3,1')
+    results_pages = analyzer_pages.analyze()
+    assert results_pages == [results_with_profile[0], results_with_profile[2]], "Selected pages should match"
+    assert analyzer_pages.get_summary()['total_pages'] == 2, "Summary should only count selected pages"
+    print("✓ Only selected pages are analyzed")
+
+    # Test rendering without anti-aliasing
+    print("\n20. Testing analysis without anti-aliasing...")
+    aa_level = fitz.TOOLS.show_aa_level()
+    analyzer_aliased = PDFInkAnalyzer(test_pdf, dpi=150, anti_aliasing=False)
+    for page_aliased, page_full in zip(analyzer_aliased.analyze(), results):
+        for key in ('cyan_avg', 'magenta_avg', 'yellow_avg', 'black_avg'):
+            assert abs(page_aliased[key] - page_full[key]) < 0.5, "Coverage should barely change"
+    assert fitz.TOOLS.show_aa_level() == aa_level, "Anti-aliasing level should be restored"
+    print("✓ Anti-aliasing can be disabled and is restored afterwards")
+
+    # Test the result cache
+    print("\n21. Testing the result cache...")
+    cache_dir = tempfile.mkdtemp()
+    PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                   keep_results=False, cache_dir=cache_dir).analyze()
+    assert len(list(Path(cache_dir).glob('*.jsonl'))) == 1, "Results should be cached without keeping them"
+    analyzer_cached = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                     cache_dir=cache_dir)
+    assert analyzer_cached.analyze() == results_with_profile, "Cached results should match"
+    assert analyzer_cached.get_summary(copies=50) == summary, "Cached summary should match"
+    PDFInkAnalyzer(test_pdf, dpi=100, cache_dir=cache_dir).analyze()
+    assert len(list(Path(cache_dir).glob('*.jsonl'))) == 2, "Other settings should be cached separately"
+    unrelated = Path(cache_dir) / "report.json"
+    unrelated.write_text("{}", encoding='utf-8')
+    analyzer_evict = PDFInkAnalyzer(test_pdf, dpi=120, cache_dir=cache_dir)
+    analyzer_evict.RESULT_CACHE_SIZE = 1
+    analyzer_evict.analyze()
+    assert unrelated.exists(), "Eviction should only remove cache entries"
+    assert len(list(Path(cache_dir).glob('*.jsonl'))) == 1, "Eviction should keep RESULT_CACHE_SIZE entries"
+    cache_entry = analyzer_evict._result_cache_path()
+    for truncated in (cache_entry.read_bytes()[:20], b''.join(cache_entry.read_bytes().splitlines(True)[:-1])):
+        cache_entry.write_bytes(truncated)
+        assert PDFInkAnalyzer(test_pdf, dpi=120, cache_dir=cache_dir).analyze() == \
+            PDFInkAnalyzer(test_pdf, dpi=120).analyze(), "Truncated cache entry should be analyzed again"
+    real_utime = os.utime
+    def evict_and_touch(path, *args, **kwargs):
+        Path(path).unlink()
+        return real_utime(path, *args, **kwargs)
+    os.utime = evict_and_touch
+    try:
+        results_evicted = PDFInkAnalyzer(test_pdf, dpi=120, cache_dir=cache_dir).analyze()
+    finally:
+        os.utime = real_utime
+    assert results_evicted == PDFInkAnalyzer(test_pdf, dpi=120).analyze(), \
+        "Entry evicted after it was read should still give its results"
+    print("✓ Repeated analyses are read from the cache")
+
+    # Test streaming CSV rows during analysis
+    print("\n22. Testing CSV streaming without keeping per-page results...")
+    stream_output = "/tmp/test_stream_results.csv"
+    PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                   keep_results=False, stream_csv=stream_output).analyze()
+    assert Path(stream_output).read_bytes() == Path(csv_output).read_bytes(), "Streamed CSV should match export"
+    rejected = False
+    try:
+        PDFInkAnalyzer(test_pdf, dpi=150, pages='9', stream_csv=stream_output).analyze()
+    except ValueError:
+        rejected = True
+    assert rejected, "Page beyond the document should be rejected"
+    assert Path(stream_output).read_bytes() == Path(csv_output).read_bytes(), "Failed analysis should keep the CSV"
+    print("✓ Streamed CSV matches exported CSV")
+
+    print("\n23. Testing JSON Lines streaming...")
+    jsonl_output = "/tmp/test_stream_results.jsonl"
+    jsonl_analyzer = PDFInkAnalyzer(test_pdf, dpi=150, printer_profile=PrinterProfile('inkjet_standard'),
+                                    keep_results=False, stream_jsonl=jsonl_output)
+    jsonl_analyzer.analyze()
+    jsonl_analyzer.append_jsonl_summary(jsonl_output, copies=test_copies)
+    lines = [json.loads(line) for line in Path(jsonl_output).read_text(encoding='utf-8').splitlines()]
+    exported = json.loads(Path(json_output).read_text(encoding='utf-8'))
+    assert lines[:-1] == exported['pages'], "JSON Lines pages should match JSON export"
+    assert lines[-1] == {'summary': exported['summary']}, "Last JSON line should hold the summary"
+    print(f"✓ {len(lines) - 1} page lines and a summary line match the JSON export")
+
+    print("\n24. Testing the command line on a directory of PDFs...")
+    with tempfile.TemporaryDirectory() as batch_dir:
+        source = Path(batch_dir) / "pdfs"
+        (source / "nested").mkdir(parents=True)
+        for copy_path in (source / "top.pdf", source / "nested" / "copy.PDF"):
+            copy_path.write_bytes(Path(test_pdf).read_bytes())
+        reports = Path(batch_dir) / "reports"
+        main([str(source), '--recursive', '--quiet', '--no-cache', '--csv', str(reports)])
+        assert (reports / "top.csv").read_bytes() == Path(csv_output).read_bytes(), "Batch CSV should match export"
+        assert (reports / "nested" / "copy.csv").exists(), "Batch should include subdirectories and .PDF files"
+    print("✓ Batch mode wrote one CSV per PDF, mirroring the source layout")
+
+    print("\n25. Testing TAC maximum precision on photographic pages...")
+    noise = np.random.default_rng(0).integers(0, 60, size=(300, 300, 3), dtype=np.uint8)
+    cmy_table, black_table = analyzer._coverage_tables()
+    max_rgb = noise.max(axis=2).astype(np.intp)
+    noise_tac = sum(cmy_table[max_rgb << 8 | noise[:, :, index]] for index in range(3)) + black_table[max_rgb]
+    assert analyzer._reduce_page_rgb(noise)['tac_max'] == noise_tac.max(), "RGB TAC maximum should be exact"
+    noise_cmyk = np.random.default_rng(1).integers(0, 256, size=(300, 300, 4), dtype=np.uint8)
+    analyzer_device = PDFInkAnalyzer(test_pdf, dpi=150, conversion_method='device_cmyk')
+    device_table = analyzer_device._compensate_dot_gain(np.arange(256) / 255.0 * 100)
+    device_tac = sum(device_table[noise_cmyk[:, :, index]] for index in range(4))
+    assert analyzer_device._reduce_page_cmyk(noise_cmyk)['tac_max'] == device_tac.max(), "CMYK TAC maximum should be exact"
+    print("✓ TAC maximum matches a float64 evaluation of every pixel")
+
     print("\n" + "=" * 80)
     print("All tests passed! ✓")
     print("=" * 80)